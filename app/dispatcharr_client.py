@@ -5,12 +5,16 @@ Handles authentication and API calls to Dispatcharr IPTV management system
 """
 import json
 import requests
+from requests.adapters import HTTPAdapter
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
+from time import monotonic
 
 logger = logging.getLogger(__name__)
 
+ENABLED_GROUPS_TTL = 30  # seconds to reuse the enabled group list between calls
+
 
 class DispatcharrClient:
     """Client for Dispatcharr API interactions"""
@@ -30,6 +34,17 @@ class DispatcharrClient:
         self.access_token = None
         self.refresh_token = None
         self.token_expires_at = None
+        self._enabled_groups_cache = None
+        self._enabled_groups_index = {}
+        self._enabled_groups_cache_ts = 0.0
+        self._headers = None
+        self._headers_token = None
+        
+        # Keep-alive connection pool shared by every call made through this client
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
     def authenticate(self) -> bool:
         """
@@ -57,7 +72,7 @@ class DispatcharrClient:
             logger.info(f"Password: {'*' * len(self.password)} (length: {len(self.password)})")
             logger.info(f"Payload: {json.dumps({k: v if k != 'password' else '***' for k, v in payload.items()})}")
             
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
+            response = self.session.post(url, json=payload, headers=headers, timeout=10)
             
             # Log the response for debugging
             logger.info(f"Auth response status: {response.status_code}")
@@ -130,7 +145,7 @@ class DispatcharrClient:
             }
             
             logger.info("Refreshing access token...")
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
+            response = self.session.post(url, json=payload, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -177,11 +192,14 @@ class DispatcharrClient:
         return True
     
     def _get_headers(self) -> Dict[str, str]:
-        """Get headers with authentication token"""
-        return {
-            'accept': 'application/json',
-            'Authorization': f'Bearer {self.access_token}'
-        }
+        """Get headers with authentication token, rebuilt only when the token changes"""
+        if self._headers is None or self._headers_token != self.access_token:
+            self._headers = {
+                'accept': 'application/json',
+                'Authorization': f'Bearer {self.access_token}'
+            }
+            self._headers_token = self.access_token
+        return self._headers
     
     def get_m3u_accounts(self) -> List[Dict[str, Any]]:
         """
@@ -195,7 +213,7 @@ class DispatcharrClient:
         
         try:
             url = f"{self.base_url}/api/m3u/accounts/"
-            response = requests.get(url, headers=self._get_headers(), timeout=10)
+            response = self.session.get(url, headers=self._get_headers(), timeout=10)
             response.raise_for_status()
             
             accounts = response.json()
@@ -218,7 +236,7 @@ class DispatcharrClient:
         
         try:
             url = f"{self.base_url}/api/channels/groups/"
-            response = requests.get(url, headers=self._get_headers(), timeout=10)
+            response = self.session.get(url, headers=self._get_headers(), timeout=10)
             response.raise_for_status()
             
             groups = response.json()
@@ -244,7 +262,7 @@ class DispatcharrClient:
         
         try:
             url = f"{self.base_url}/api/channels/groups/{group_id}/"
-            response = requests.get(url, headers=self._get_headers(), timeout=10)
+            response = self.session.get(url, headers=self._get_headers(), timeout=10)
             response.raise_for_status()
             
             return response.json()
@@ -253,14 +271,50 @@ class DispatcharrClient:
             logger.error(f"Failed to get group {group_id} details: {e}")
             return None
     
-    def get_enabled_groups(self) -> List[Dict[str, Any]]:
+    def get_enabled_groups(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
         """
-        Get all enabled channel groups with active M3U accounts AND local groups
-        Filters for: is_active=true, enabled=true, OR m3u_account_count=0 with channel_count > 0
+        Get all enabled channel groups with active M3U accounts AND local groups,
+        reusing the last result for ENABLED_GROUPS_TTL seconds
         
+        Args:
+            force_refresh: Fetch from Dispatcharr even if a cached list is available
+            
         Returns:
             List of enabled group dictionaries with enhanced info
         """
+        enabled_groups, _ = self.get_enabled_groups_indexed(force_refresh)
+        # Callers annotate the group dicts, so hand out copies
+        return [dict(group) for group in enabled_groups]
+    
+    def get_enabled_groups_indexed(self, force_refresh: bool = False) -> Tuple[List[Dict[str, Any]], Dict[int, Dict[str, Any]]]:
+        """
+        Get the enabled groups together with a lookup by group ID, both cached like get_enabled_groups
+        
+        The returned dicts are shared with the cache and must not be modified.
+        
+        Returns:
+            Tuple of (enabled groups, {group ID: first enabled group with that ID})
+        """
+        if (not force_refresh and self._enabled_groups_cache is not None
+                and monotonic() - self._enabled_groups_cache_ts < ENABLED_GROUPS_TTL):
+            return self._enabled_groups_cache, self._enabled_groups_index
+        
+        enabled_groups = self._fetch_enabled_groups()
+        groups_by_id = {}
+        for group in enabled_groups:
+            # A group linked from several accounts is listed more than once; the first entry wins
+            groups_by_id.setdefault(group['id'], group)
+        if enabled_groups:
+            self._enabled_groups_cache = enabled_groups
+            self._enabled_groups_index = groups_by_id
+            self._enabled_groups_cache_ts = monotonic()
+        return enabled_groups, groups_by_id
+    
+    def _fetch_enabled_groups(self) -> List[Dict[str, Any]]:
+        """
+        Fetch enabled groups from Dispatcharr
+        Filters for: is_active=true, enabled=true, OR m3u_account_count=0 with channel_count > 0
+        """
         # Get all groups
         all_groups = self.get_all_groups()
         if not all_groups:
@@ -379,7 +433,7 @@ class DispatcharrClient:
         result['groups_count'] = len(groups)
         
         # Test getting enabled groups
-        enabled = self.get_enabled_groups()
+        enabled = self.get_enabled_groups(force_refresh=True)
         result['enabled_groups_count'] = len(enabled)
         
         result['success'] = True
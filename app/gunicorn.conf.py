@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Gunicorn configuration
+Rules, caches and the sync scheduler live in process memory, so the app runs as a
+single worker and gets its concurrency from threads (DVR/Dispatcharr calls are I/O-bound)
+"""
+import os
+
+bind = '0.0.0.0:5000'
+
+# One worker: a second worker would load its own copy of the rules and run every sync twice
+workers = 1
+worker_class = 'gthread'
+threads = int(os.environ.get('WEB_THREADS', '8'))
+keepalive = 5
+
+# Syncs can hold a request thread while the DVR responds
+timeout = 120
+
+
+def post_worker_init(worker):
+    """Start the scheduler inside the worker that serves the app"""
+    from main import start_background_jobs
+    start_background_jobs()
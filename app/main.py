@@ -1,16 +1,26 @@
 #!/usr/bin/env python3
 import os
 import re
+import copy
+import hashlib
+from io import BytesIO
 import json
 import logging
 import uuid
-from datetime import datetime, time
-from typing import List, Dict, Any, Set, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from itertools import groupby
+from time import monotonic
+from typing import List, Dict, Any, Optional, Tuple
 from flask import Flask, render_template, request, jsonify, send_file
+from flask.json.provider import JSONProvider
 from apscheduler.schedulers.background import BackgroundScheduler
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import tempfile
-from io import BytesIO
 
 # Import Dispatcharr client
 try:
@@ -18,6 +28,12 @@ try:
 except ImportError:
     from app.dispatcharr_client import DispatcharrClient
 
+# Import rule matching (a separate module so matching processes don't load the app)
+try:
+    from matching import prepare_rule, match_prepared, matching_indices, match_rules_in_pool
+except ImportError:
+    from app.matching import prepare_rule, match_prepared, matching_indices, match_rules_in_pool
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -28,12 +44,81 @@ app = Flask(__name__,
             static_url_path='/static')
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key')
 
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (much faster on large channel lists)"""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
+app.json = OrjsonProvider(app)
+
 # Configuration
 DVR_URL = os.environ.get('DVR_URL', 'http://channelsdvr:8089')
 CONFIG_FILE = '/config/rules.json'
 DISPATCHARR_CONFIG_FILE = '/config/dispatcharr.json'
 SETTINGS_FILE = '/config/settings.json'
+TEMPLATES_FILE = '/config/templates.json'
 SYNC_INTERVAL = int(os.environ.get('SYNC_INTERVAL_MINUTES', '60'))  # env var default
+CHANNELS_CACHE_TTL = 30  # seconds to reuse the DVR channel list between calls
+CHANNELS_FETCH_TIMEOUT = 30  # seconds to wait on a DVR channel list download (or on another request's)
+RESCAN_WORKERS = 4  # concurrent source rescans triggered before a sync
+DEVICE_FETCH_WORKERS = 4  # concurrent per-device channel list downloads
+COLLECTION_UPDATE_WORKERS = 4  # concurrent collection PUTs in a batch update
+AUTOSYNC_WORKERS = 8  # concurrent Dispatcharr pattern updates at the start of sync_all
+TASK_WORKERS = 4  # background tasks (e.g. Dispatcharr updates) started from the API
+MAX_TRACKED_TASKS = 100  # finished background tasks kept for polling
+MATCH_PROCESSES = int(os.environ.get('MATCH_PROCESSES', str(os.cpu_count() or 1)))  # rule matching processes
+# Matching costs ~1.7us per rule x channel; handing the channel list to the pool costs ~1.2us per
+# channel per process plus ~15ms, so the pool only wins once there are a few rules and enough work
+MATCH_PROCESS_MIN_RULES = 4  # fewer rules than this are matched in-process
+MATCH_PROCESS_THRESHOLD = 100000  # rules x channels before matching moves to the process pool
+
+# Event/placeholder channel detection used by "events_last" sorting
+_EVENT_RE = re.compile(r'\bEvent\s+(\d+)', re.IGNORECASE)
+# Matches: "Paramount+ 50 :", ":Paramount+ 97", "DAZN UK - 50", etc.
+# These are just provider + number with optional leading colon or trailing colon
+_PLACEHOLDER_RES = [
+    re.compile(r'^:?\s*[\w\s]+(Plus|\+)[\s\-:]+\d+[\s:]*$', re.IGNORECASE),  # :Paramount+ 50 or Paramount+ 50 :
+    re.compile(r'^[\w\s]+[\s\-]+\d+[\s:]*$', re.IGNORECASE),  # Provider Name - 50 :
+]
+_PROGRAM_PREFIX_RE = re.compile(r'^.{30,}:')
+_PROVIDER_NUMBER_RE = re.compile(r'(Plus|\+)[\s\-:]+(\d+)', re.IGNORECASE)
+
+# Dispatcharr rule patterns containing a digit are channel-number patterns
+_HAS_DIGIT_RE = re.compile(r'\d')
+
+
+def write_file_atomic(path: str, data: bytes) -> bool:
+    """
+    Replace a file's contents via a fsynced temp file and os.replace, so readers never
+    see a partial write. Returns False (and leaves the file untouched) if nothing changed.
+    """
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}-", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600; keep the file readable as before
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
 
 
 def load_app_settings() -> Dict[str, Any]:
@@ -103,40 +188,136 @@ class ChannelsAPI:
     
     def __init__(self, base_url: str):
         self.base_url = base_url.rstrip('/')
+        
+        # Shared session: keep-alive connections, retries on transient gateway errors, compressed JSON
+        retry = Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist={502, 503, 504},
+            allowed_methods={'GET', 'PUT'},
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_maxsize=32)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Accept-Encoding': 'gzip', 'Connection': 'keep-alive'})
+        
+        self._channels_cache = None
+        self._channels_cache_ts = 0.0
+        self._channels_generation = 0  # bumped on invalidation so in-flight fetches don't repopulate the cache
+        self._channels_fetch = None  # Future shared by callers waiting on the in-flight fetch
+        self._channels_lock = threading.Lock()
+        self._collections_cache = None
+        self._collections_cache_ts = 0.0
+        self._channel_map = {}
+        self._channel_map_source = None
+    
+    def invalidate_channels_cache(self):
+        """Drop the cached channel list so the next get_channels() hits the DVR"""
+        with self._channels_lock:
+            self._channels_cache = None
+            self._channels_cache_ts = 0.0
+            self._channels_generation += 1
+            self._channels_fetch = None
+    
+    def invalidate_collections_cache(self):
+        """Drop the cached collection list so the next get_collections() hits the DVR"""
+        self._collections_cache = None
+        self._collections_cache_ts = 0.0
+    
+    def get_channels(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """Fetch all available channels, reusing the last result for CHANNELS_CACHE_TTL seconds"""
+        with self._channels_lock:
+            if force_refresh:
+                self._channels_generation += 1
+                self._channels_fetch = None
+            elif (self._channels_cache is not None
+                    and monotonic() - self._channels_cache_ts < CHANNELS_CACHE_TTL):
+                return self._channels_cache
+            
+            # Concurrent requests on a cold cache wait on one DVR fan-out instead of starting their own
+            pending = self._channels_fetch
+            if pending is None:
+                fetch = self._channels_fetch = Future()
+                generation = self._channels_generation
+        
+        if pending is not None:
+            try:
+                return pending.result(timeout=CHANNELS_FETCH_TIMEOUT)
+            except TimeoutError:
+                logger.warning("Timed out waiting for the DVR channel list")
+                return self._channels_cache or []
+        
+        # The lock is released for the download so a slow DVR can't block other callers
+        all_channels = self._fetch_channels()
+        with self._channels_lock:
+            if all_channels is not None and generation == self._channels_generation:
+                self._channels_cache = all_channels
+                self._channels_cache_ts = monotonic()
+            if self._channels_fetch is fetch:
+                self._channels_fetch = None
+        fetch.set_result(all_channels or [])
+        return all_channels or []
     
-    def get_channels(self) -> List[Dict[str, Any]]:
-        """Fetch all available channels"""
+    def _fetch_channels(self) -> Optional[List[Dict[str, Any]]]:
+        """Fetch channels from every device, or None if the DVR request failed"""
         try:
-            response = requests.get(f"{self.base_url}/devices")
+            response = self.session.get(f"{self.base_url}/devices", timeout=5)
             devices = response.json()
             
-            all_channels = []
-            for device in devices:
+            def fetch_device_channels(device: Dict[str, Any]) -> List[Dict[str, Any]]:
                 device_name = device.get('FriendlyName', 'Unknown')
                 device_id = device.get('DeviceID', '')
-                channels_response = requests.get(f"{self.base_url}/devices/{device['DeviceID']}/channels")
-                if channels_response.status_code == 200:
-                    channels = channels_response.json()
-                    # Add device info to each channel
-                    for channel in channels:
-                        channel['_device_name'] = device_name
-                        channel['_device_id'] = device_id
+                channels_response = self.session.get(f"{self.base_url}/devices/{device['DeviceID']}/channels",
+                                                     timeout=CHANNELS_FETCH_TIMEOUT)
+                if channels_response.status_code != 200:
+                    return []
+                channels = orjson.loads(channels_response.content)
+                # Add device info to each channel
+                for channel in channels:
+                    channel['_device_name'] = device_name
+                    channel['_device_id'] = device_id
+                return channels
+            
+            # Fetch devices concurrently so one device's download overlaps another's parse
+            all_channels = []
+            with ThreadPoolExecutor(max_workers=DEVICE_FETCH_WORKERS) as executor:
+                for channels in executor.map(fetch_device_channels, devices):
                     all_channels.extend(channels)
             
             return all_channels
         except Exception as e:
             logger.error(f"Error fetching channels: {e}")
-            return []
+            return None
+    
+    def get_channel_map(self, force_refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Return an ID -> channel index of get_channels(), rebuilt only when the channel list changes"""
+        return self.channel_map_for(self.get_channels(force_refresh=force_refresh))
+    
+    def channel_map_for(self, channels: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Return an ID -> channel index of a list returned by get_channels(), without fetching again"""
+        with self._channels_lock:
+            if channels is not self._channel_map_source:
+                self._channel_map = {ch.get('ID'): ch for ch in channels}
+                self._channel_map_source = channels
+            return self._channel_map
     
-    def get_collections(self) -> List[Dict[str, Any]]:
-        """Fetch all channel collections using the correct endpoint"""
+    def get_collections(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """Fetch all channel collections, reusing the last result for CHANNELS_CACHE_TTL seconds"""
+        if (not force_refresh and self._collections_cache is not None
+                and monotonic() - self._collections_cache_ts < CHANNELS_CACHE_TTL):
+            return self._collections_cache
+        
         try:
             # Use the correct collections endpoint
-            response = requests.get(f"{self.base_url}/dvr/collections/channels")
+            response = self.session.get(f"{self.base_url}/dvr/collections/channels")
             if response.status_code == 200:
                 data = response.json()
                 # This endpoint returns a list of collections
                 if isinstance(data, list):
+                    self._collections_cache = data
+                    self._collections_cache_ts = monotonic()
                     return data
                 return []
             logger.warning(f"Failed to fetch collections: status {response.status_code}")
@@ -149,7 +330,7 @@ class ChannelsAPI:
         """Fetch a specific collection using slug"""
         try:
             # Use the correct collections endpoint with slug
-            response = requests.get(f"{self.base_url}/dvr/collections/channels/{collection_slug}")
+            response = self.session.get(f"{self.base_url}/dvr/collections/channels/{collection_slug}")
             if response.status_code == 200:
                 return response.json()
             
@@ -163,14 +344,28 @@ class ChannelsAPI:
         """Update a collection using the correct endpoint"""
         try:
             # Use PUT to update collection at the correct endpoint
-            response = requests.put(
+            response = self.session.put(
                 f"{self.base_url}/dvr/collections/channels/{collection_slug}",
                 json=collection_data
             )
-            return response.status_code == 200
+            if response.status_code == 200:
+                self.invalidate_collections_cache()
+                return True
+            return False
         except Exception as e:
             logger.error(f"Error updating collection {collection_slug}: {e}")
             return False
+    
+    def batch_update_collections(self, updates: Dict[str, Dict[str, Any]]) -> Dict[str, bool]:
+        """
+        Update several collections in one pass, returning success per slug
+        Channels DVR has no batch endpoint, so the PUTs are pipelined over the session's keep-alive pool
+        """
+        if not updates:
+            return {}
+        with ThreadPoolExecutor(max_workers=COLLECTION_UPDATE_WORKERS) as executor:
+            statuses = executor.map(lambda item: self.update_collection(*item), updates.items())
+            return dict(zip(updates, statuses))
 
 
 class RuleManager:
@@ -178,152 +373,176 @@ class RuleManager:
     
     def __init__(self, config_file: str):
         self.config_file = config_file
+        # Serializes writers. Writers replace the rules list instead of editing it in place,
+        # so readers can take self.rules once and iterate it without locking.
+        self._lock = threading.RLock()
+        self._rules_version = 0  # bumped on every save so derived data (e.g. exports) can be cached
+        self._prepared: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}  # rule id -> (rule, prepared)
         self.rules = self.load_rules()
     
+    @property
+    def rules(self) -> List[Dict[str, Any]]:
+        return self._rules
+    
+    @property
+    def rules_version(self) -> int:
+        """Counter bumped on every save, for caching data derived from the rules"""
+        return self._rules_version
+    
+    @rules.setter
+    def rules(self, rules: List[Dict[str, Any]]):
+        with self._lock:
+            self._rules = rules
+            self._reindex()
+    
+    def _reindex(self):
+        """Rebuild the id, group, collection and AutoSync lookups after the rules list changed"""
+        by_id = {}
+        by_group = {}
+        by_slug = {}
+        autosync_group_ids = set()
+        for rule in self.rules:
+            rule_id = rule.get('id')
+            by_id[rule_id] = rule
+            group = rule.get('group', 'ungrouped')
+            if group:
+                by_group.setdefault(group, set()).add(rule_id)
+            by_slug.setdefault(rule.get('collection_slug'), []).append(rule)
+            if rule.get('dispatcharr_autosync') and rule.get('_dispatcharr_group_id'):
+                autosync_group_ids.add(rule['_dispatcharr_group_id'])
+        self._by_id = by_id
+        self._by_group = by_group
+        self._by_slug = by_slug
+        self._autosync_group_ids = frozenset(autosync_group_ids)  # Dispatcharr groups with an AutoSync rule
+        # Drop compiled matchers for deleted rules
+        self._prepared = {rid: entry for rid, entry in self._prepared.items() if rid in by_id}
+    
     def load_rules(self) -> List[Dict[str, Any]]:
         """Load rules from config file"""
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r') as f:
-                    return json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    return orjson.loads(f.read())
             except Exception as e:
                 logger.error(f"Error loading rules: {e}")
         return []
     
     def save_rules(self) -> bool:
         """Save rules to config file"""
-        try:
-            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-            with open(self.config_file, 'w') as f:
-                json.dump(self.rules, f, indent=2)
-            return True
-        except Exception as e:
-            logger.error(f"Error saving rules: {e}")
-            return False
+        with self._lock:
+            self._rules_version += 1
+            self._reindex()
+            try:
+                # A crash mid-write never truncates the rules
+                write_file_atomic(self.config_file, orjson.dumps(self.rules, option=orjson.OPT_INDENT_2))
+                return True
+            except Exception as e:
+                logger.error(f"Error saving rules: {e}")
+                return False
     
     def add_rule(self, rule: Dict[str, Any]) -> bool:
         """Add a new rule"""
-        rule['id'] = datetime.now().strftime('%Y%m%d%H%M%S%f')
-        self.rules.append(rule)
-        return self.save_rules()
+        rule['id'] = uuid.uuid4().hex
+        with self._lock:
+            self.rules = self.rules + [rule]
+            return self.save_rules()
+    
+    def add_rules(self, rules: List[Dict[str, Any]]) -> bool:
+        """Add several rules with fresh IDs and save once"""
+        for rule in rules:
+            rule['id'] = uuid.uuid4().hex
+        with self._lock:
+            self.rules = self.rules + rules
+            return self.save_rules()
     
     def update_rule(self, rule_id: str, rule: Dict[str, Any]) -> bool:
         """Update an existing rule"""
-        for i, r in enumerate(self.rules):
-            if r.get('id') == rule_id:
-                rule['id'] = rule_id
-                self.rules[i] = rule
-                return self.save_rules()
-        return False
+        with self._lock:
+            existing = self._by_id.get(rule_id)
+            if existing is None:
+                return False
+            rule['id'] = rule_id
+            rules = list(self.rules)
+            rules[rules.index(existing)] = rule
+            self.rules = rules
+            return self.save_rules()
+    
+    def update_rule_patterns(self, rule_id: str, patterns: List[str], match_types: List[str]) -> bool:
+        """Replace only a rule's patterns and match types on its current version; False if it no longer exists"""
+        with self._lock:
+            existing = self._by_id.get(rule_id)
+            if existing is None:
+                return False
+            if existing.get('patterns') == patterns and existing.get('match_types') == match_types:
+                return True
+            # Re-read under the lock so edits saved while Dispatcharr was queried are kept
+            rules = list(self.rules)
+            rules[rules.index(existing)] = {**existing, 'patterns': patterns, 'match_types': match_types}
+            self.rules = rules
+            return self.save_rules()
     
     def delete_rule(self, rule_id: str) -> bool:
         """Delete a rule"""
-        self.rules = [r for r in self.rules if r.get('id') != rule_id]
-        return self.save_rules()
+        with self._lock:
+            if rule_id in self._by_id:
+                self.rules = [r for r in self.rules if r.get('id') != rule_id]
+            return self.save_rules()
+    
+    def get_rule(self, rule_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a rule by ID"""
+        return self._by_id.get(rule_id)
+    
+    def get_groups(self) -> List[str]:
+        """Get the sorted names of all rule groups"""
+        return sorted(self._by_group)
+    
+    @property
+    def autosync_group_ids(self) -> frozenset:
+        """Dispatcharr group IDs that have an AutoSync rule, kept current by _reindex"""
+        return self._autosync_group_ids
+    
+    def get_collection_rules(self, collection_slug: str) -> List[Dict[str, Any]]:
+        """Get all rules targeting a collection"""
+        return self._by_slug.get(collection_slug, [])
+    
+    def _get_prepared(self, rule: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the rule's compiled matcher, preparing it only when the rule object changed"""
+        rule_id = rule.get('id')
+        entry = self._prepared.get(rule_id)
+        # Rules are replaced, never edited in place, so an identical object means identical patterns
+        if entry and entry[0] is rule:
+            return entry[1]
+        prepared = prepare_rule(rule)
+        if rule_id:
+            # _reindex rebuilds this dict under the lock while syncs fill it from worker threads
+            with self._lock:
+                self._prepared[rule_id] = (rule, prepared)
+        return prepared
     
     def match_channel(self, channel: Dict[str, Any], rule: Dict[str, Any]) -> bool:
         """Check if a channel matches a rule"""
-        # First check source filters
-        include_sources = rule.get('include_sources', [])
-        exclude_sources = rule.get('exclude_sources', [])
-        device_id = channel.get('_device_id', '')
-        
-        # If include sources specified, channel must be from one of them
-        if include_sources and device_id not in include_sources:
-            return False
-        
-        # If exclude sources specified, channel must NOT be from one of them
-        if exclude_sources and device_id in exclude_sources:
-            return False
-        
-        patterns = rule.get('patterns', [])
-        match_types = rule.get('match_types', ['name'])
-        
-        # Expand comma-separated patterns (e.g., "101-105,107-108" -> ["101-105", "107-108"])
-        expanded_patterns = []
-        for pattern in patterns:
-            if ',' in pattern and 'number' in match_types:
-                # Split comma-separated patterns for number matching
-                expanded_patterns.extend([p.strip() for p in pattern.split(',')])
-            else:
-                expanded_patterns.append(pattern)
-        
-        for pattern in expanded_patterns:
-            try:
-                # Check if pattern is a single number (e.g., "115")
-                if pattern.replace('.', '').isdigit() and 'number' in match_types:
-                    channel_num = channel.get('GuideNumber', '')
-                    if channel_num:
-                        try:
-                            if float(channel_num) == float(pattern):
-                                return True
-                        except ValueError:
-                            pass
-                
-                # Check if pattern is a channel number range (e.g., "100-200")
-                elif '-' in pattern and pattern.replace('-', '').replace('.', '').isdigit():
-                    # This is a number range
-                    parts = pattern.split('-')
-                    if len(parts) == 2:
-                        try:
-                            start = float(parts[0])
-                            end = float(parts[1])
-                            channel_num = channel.get('GuideNumber', '')
-                            if channel_num:
-                                # Convert channel number to float for comparison
-                                try:
-                                    num = float(channel_num)
-                                    if start <= num <= end:
-                                        return True
-                                except ValueError:
-                                    pass
-                        except ValueError:
-                            pass
-                
-                # Regular regex matching
-                regex = re.compile(pattern, re.IGNORECASE)
-                
-                # Check channel name
-                if 'name' in match_types:
-                    channel_name = channel.get('GuideName', '')
-                    if regex.search(channel_name):
-                        return True
-                
-                # Check channel number
-                if 'number' in match_types:
-                    channel_number = str(channel.get('GuideNumber', ''))
-                    # Use word boundaries to prevent partial matches (e.g., 400 shouldn't match 6400)
-                    # Add word boundary if pattern is purely numeric
-                    if pattern.replace('.', '').replace(',', '').isdigit():
-                        # Pure number pattern - use exact word boundary matching
-                        bounded_pattern = r'\b' + re.escape(pattern) + r'\b'
-                        if re.search(bounded_pattern, channel_number):
-                            return True
-                    else:
-                        # Non-numeric pattern - use normal regex
-                        if regex.search(channel_number):
-                            return True
-                
-                # Check EPG data (callsign, affiliate, etc)
-                if 'epg' in match_types:
-                    callsign = channel.get('Callsign', '')
-                    affiliate = channel.get('Affiliate', '')
-                    if regex.search(callsign) or regex.search(affiliate):
-                        return True
-                
-            except re.error as e:
-                logger.error(f"Invalid regex pattern '{pattern}': {e}")
-                continue
-        
-        return False
+        return match_prepared(channel, self._get_prepared(rule))
     
     def get_matching_channels(self, channels: List[Dict[str, Any]], rule: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Get all channels matching a rule"""
-        matching = []
-        for channel in channels:
-            if self.match_channel(channel, rule):
-                matching.append(channel)
-        return matching
+        prepared = self._get_prepared(rule)
+        return [channel for channel in channels if match_prepared(channel, prepared)]
+    
+    def match_rules(self, rules: List[Dict[str, Any]], channels: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Get the matching channels for each rule, in rule order"""
+        prepared_rules = [self._get_prepared(rule) for rule in rules]
+        
+        if (MATCH_PROCESSES > 1 and len(rules) >= MATCH_PROCESS_MIN_RULES
+                and len(rules) * len(channels) >= MATCH_PROCESS_THRESHOLD):
+            # Big workloads are CPU-bound regex matching: spread rules across the matching
+            # processes to get around the GIL
+            try:
+                all_indices = match_rules_in_pool(prepared_rules, channels, MATCH_PROCESSES)
+                return [[channels[i] for i in indices] for indices in all_indices]
+            except Exception as e:
+                logger.warning(f"Parallel rule matching failed, matching in-process: {e}")
+        
+        return [[channels[i] for i in matching_indices(channels, prepared)] for prepared in prepared_rules]
 
 
 class SyncManager:
@@ -334,45 +553,53 @@ class SyncManager:
         self.rule_manager = rule_manager
         self.last_sync = None
         self.last_sync_results = {}
+        # Manual syncs run one at a time in the background; (job id, future) of the latest one
+        self._sync_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sync')
+        self._sync_job_lock = threading.Lock()
+        self._sync_job: Optional[Tuple[str, Any]] = None
+    
+    def submit_sync(self) -> str:
+        """Start sync_all in the background and return its job ID, or the running job's ID"""
+        with self._sync_job_lock:
+            if self._sync_job and not self._sync_job[1].done():
+                return self._sync_job[0]
+            job_id = uuid.uuid4().hex
+            self._sync_job = (job_id, self._sync_executor.submit(self.sync_all))
+            return job_id
+    
+    def sync_job_status(self) -> Dict[str, Any]:
+        """Get the state of the latest background sync and its results once done"""
+        with self._sync_job_lock:
+            job = self._sync_job
+        if job is None:
+            return {'job_id': None, 'state': 'idle', 'results': self.last_sync_results}
+        job_id, future = job
+        if not future.done():
+            return {'job_id': job_id, 'state': 'running', 'results': self.last_sync_results}
+        # Scheduled syncs call sync_all directly, so the job's results are only current if no
+        # later run has recorded its own (runs that stop early, e.g. with no rules, record nothing)
+        results = future.result()
+        if self.last_sync_results.get('timestamp', '') > results.get('timestamp', ''):
+            results = self.last_sync_results
+        return {'job_id': job_id, 'state': 'done', 'results': results}
     
     def _sort_channels(self, channel_ids: List[str], channel_map: Dict[str, Dict], sort_order: str) -> List[str]:
         """Sort channel IDs based on the specified order"""
-        import re  # Import at method level for all uses
-        
-        def get_sort_key(channel_id: str):
-            channel = channel_map.get(channel_id, {})
-            name = channel.get('GuideName', '')
-            number = channel.get('GuideNumber', '')
-            
-            # Convert channel number to sortable format
-            try:
-                num_float = float(number) if number else 999999
-            except ValueError:
-                num_float = 999999
-            
-            return (name, num_float, channel_id)
-        
         def is_event_channel(channel_id: str) -> bool:
             """Check if channel is a generic placeholder (not a real program)"""
             channel = channel_map.get(channel_id, {})
             name = channel.get('GuideName', '').strip()
             
             # Pattern 1: "Event XX" anywhere in name
-            if re.search(r'\bEvent\s+\d+', name, re.IGNORECASE):
+            if _EVENT_RE.search(name):
                 return True
             
             # Pattern 2: Placeholder patterns (no program name)
-            # Matches: "Paramount+ 50 :", ":Paramount+ 97", "DAZN UK - 50", etc.
-            # These are just provider + number with optional leading colon or trailing colon
-            placeholder_patterns = [
-                r'^:?\s*[\w\s]+(Plus|\+)[\s\-:]+\d+[\s:]*$',  # :Paramount+ 50 or Paramount+ 50 :
-                r'^[\w\s]+[\s\-]+\d+[\s:]*$',  # Provider Name - 50 :
-            ]
-            for pattern in placeholder_patterns:
-                if re.search(pattern, name, re.IGNORECASE):
+            for pattern in _PLACEHOLDER_RES:
+                if pattern.search(name):
                     # But make sure it doesn't have a real program name (contains @ or long text before :)
                     # Real programs have format: "Program Name @ Date :Paramount+ XX"
-                    if '@' in name or re.search(r'^.{30,}:', name):
+                    if '@' in name or _PROGRAM_PREFIX_RE.search(name):
                         return False  # Has program info, not a placeholder
                     return True
             
@@ -382,55 +609,65 @@ class SyncManager:
             """Extract the event number from channel name for proper sorting"""
             channel = channel_map.get(channel_id, {})
             name = channel.get('GuideName', '')
-            match = re.search(r'\bEvent\s+(\d+)', name, re.IGNORECASE)
+            match = _EVENT_RE.search(name)
             if match:
                 return int(match.group(1))
             # Also try to extract from "Provider+ 50" format
-            match = re.search(r'(Plus|\+)[\s\-:]+(\d+)', name, re.IGNORECASE)
+            match = _PROVIDER_NUMBER_RE.search(name)
             if match:
                 return int(match.group(2))
             return 999999
         
+        def by_name(ids: List[str], reverse: bool = False) -> List[str]:
+            """Sort channel IDs by lowercase name, building each key once"""
+            keys = {cid: channel_map.get(cid, {}).get('GuideName', '').lower() for cid in ids}
+            return sorted(ids, key=keys.__getitem__, reverse=reverse)
+        
+        def by_number(ids: List[str], reverse: bool = False) -> List[str]:
+            """Sort channel IDs by channel number, unparseable numbers last"""
+            keys = {}
+            for cid in ids:
+                num = channel_map.get(cid, {}).get('GuideNumber', '')
+                try:
+                    keys[cid] = float(num) if num else 999999
+                except ValueError:
+                    keys[cid] = 999999
+            return sorted(ids, key=keys.__getitem__, reverse=reverse)
+        
         if sort_order == 'name_asc':
             # Sort alphabetically A-Z
-            return sorted(channel_ids, key=lambda cid: channel_map.get(cid, {}).get('GuideName', '').lower())
+            return by_name(channel_ids)
         
         elif sort_order == 'name_desc':
             # Sort alphabetically Z-A
-            return sorted(channel_ids, key=lambda cid: channel_map.get(cid, {}).get('GuideName', '').lower(), reverse=True)
+            return by_name(channel_ids, reverse=True)
         
         elif sort_order == 'number_asc':
             # Sort by channel number ascending
-            def num_key(cid):
-                num = channel_map.get(cid, {}).get('GuideNumber', '')
-                try:
-                    return float(num) if num else 999999
-                except ValueError:
-                    return 999999
-            return sorted(channel_ids, key=num_key)
+            return by_number(channel_ids)
         
         elif sort_order == 'number_desc':
             # Sort by channel number descending
-            def num_key(cid):
-                num = channel_map.get(cid, {}).get('GuideNumber', '')
-                try:
-                    return float(num) if num else 999999
-                except ValueError:
-                    return 999999
-            return sorted(channel_ids, key=num_key, reverse=True)
+            return by_number(channel_ids, reverse=True)
         
         elif sort_order == 'events_last':
             # Non-event channels first (sorted by name), then event channels (sorted by event number)
-            non_events = [cid for cid in channel_ids if not is_event_channel(cid)]
-            events = [cid for cid in channel_ids if is_event_channel(cid)]
-            
-            # Sort non-events alphabetically
-            non_events.sort(key=lambda cid: channel_map.get(cid, {}).get('GuideName', '').lower())
+            # Classify each channel once, extracting event numbers in the same pass
+            non_events = []
+            events = []
+            event_numbers = {}
+            for cid in channel_ids:
+                if is_event_channel(cid):
+                    events.append(cid)
+                    event_numbers[cid] = extract_event_number(cid)
+                else:
+                    non_events.append(cid)
             
             # Sort events by their event number
-            events.sort(key=extract_event_number)
+            events.sort(key=event_numbers.__getitem__)
             
-            return non_events + events
+            # Sort non-events alphabetically
+            return by_name(non_events) + events
         
         elif sort_order.startswith('regex:'):
             # Custom regex-based sorting
@@ -449,12 +686,8 @@ class SyncManager:
                     else:
                         non_matching.append(cid)
                 
-                # Sort each group alphabetically
-                matching.sort(key=lambda cid: channel_map.get(cid, {}).get('GuideName', '').lower())
-                non_matching.sort(key=lambda cid: channel_map.get(cid, {}).get('GuideName', '').lower())
-                
-                # Matching channels first, then non-matching
-                return matching + non_matching
+                # Sort each group alphabetically, matching channels first
+                return by_name(matching) + by_name(non_matching)
             except re.error as e:
                 logger.error(f"Invalid regex pattern in sort order: {pattern}: {e}")
                 return sorted(channel_ids)
@@ -468,11 +701,7 @@ class SyncManager:
         logger.info(f"Syncing specific rule: {rule_id}")
         
         # Find the rule
-        rule = None
-        for r in self.rule_manager.rules:
-            if r.get('id') == rule_id:
-                rule = r
-                break
+        rule = self.rule_manager.get_rule(rule_id)
         
         if not rule:
             logger.error(f"Rule {rule_id} not found")
@@ -485,11 +714,11 @@ class SyncManager:
         # AutoSync: update patterns from Dispatcharr before syncing
         if rule.get('dispatcharr_autosync') and rule.get('_dispatcharr_group_id'):
             logger.info(f"AutoSync: fetching latest channels for rule '{rule.get('name')}' from Dispatcharr")
-            autosync_result = _update_rule_patterns_from_dispatcharr(rule)
+            autosync_result = _update_rule_patterns_from_dispatcharr(rule_id)
             if autosync_result['success']:
                 logger.info(f"AutoSync: updated patterns to {autosync_result.get('patterns')}")
                 # Reload rule with updated patterns
-                rule = next((r for r in self.rule_manager.rules if r.get('id') == rule_id), rule)
+                rule = self.rule_manager.get_rule(rule_id) or rule
             else:
                 logger.warning(f"AutoSync update failed: {autosync_result['message']} — proceeding with existing patterns")
 
@@ -501,8 +730,6 @@ class SyncManager:
             logger.info(f"Refresh requested for rule: {rule.get('name')} (sources: {refresh_sources}, EPG: {refresh_epg})")
             
             try:
-                import threading
-                
                 def do_refresh():
                     # Refresh sources if requested
                     if refresh_sources:
@@ -515,7 +742,7 @@ class SyncManager:
                         else:
                             # Get all sources
                             try:
-                                devices_response = requests.get(f"{self.api.base_url}/devices", timeout=5)
+                                devices_response = self.api.session.get(f"{self.api.base_url}/devices", timeout=5)
                                 if devices_response.status_code == 200:
                                     all_devices = devices_response.json()
                                     sources_to_refresh = [d.get('DeviceID') for d in all_devices if d.get('DeviceID')]
@@ -530,21 +757,24 @@ class SyncManager:
                                 logger.warning(f"Error getting devices list: {e}")
                         
                         # Refresh each source
-                        for device_id in sources_to_refresh:
+                        def rescan_source(device_id):
                             try:
                                 rescan_url = f"{self.api.base_url}/dvr/sources/{device_id}/rescan"
-                                rescan_response = requests.put(rescan_url, timeout=5)
+                                rescan_response = self.api.session.put(rescan_url, timeout=5)
                                 if rescan_response.status_code == 200:
                                     logger.info(f"✓ Source {device_id} rescan triggered")
                                 else:
                                     logger.warning(f"Source {device_id} rescan returned status {rescan_response.status_code}")
                             except Exception as e:
                                 logger.warning(f"Error rescanning source {device_id}: {e}")
+                        
+                        with ThreadPoolExecutor(max_workers=RESCAN_WORKERS) as executor:
+                            list(executor.map(rescan_source, sources_to_refresh))
                     
                     # Refresh EPG if requested
                     if refresh_epg:
                         try:
-                            epg_response = requests.put(f"{self.api.base_url}/dvr/guide/refresh", timeout=5)
+                            epg_response = self.api.session.put(f"{self.api.base_url}/dvr/guide/refresh", timeout=5)
                             if epg_response.status_code == 200:
                                 logger.info("✓ EPG refresh triggered")
                             else:
@@ -552,16 +782,23 @@ class SyncManager:
                         except Exception as e:
                             logger.warning(f"Error refreshing EPG: {e}")
                 
-                # Run refresh in background thread
-                refresh_thread = threading.Thread(target=do_refresh, daemon=True)
-                refresh_thread.start()
-                
-                # Brief pause to let refresh start
-                import time
-                time.sleep(0.5)
+                # Run refresh as a one-shot scheduler job; the DVR endpoints only trigger the refresh
+                scheduler.add_job(
+                    func=do_refresh,
+                    trigger='date',
+                    run_date=datetime.now(),
+                    id=f'refresh_{rule_id}',
+                    name=f'Refresh before sync {rule.get("name")}',
+                    max_instances=1,
+                    misfire_grace_time=30,
+                    replace_existing=True
+                )
                 
             except Exception as e:
                 logger.warning(f"Error starting refresh: {e}")
+            
+            # Sources/EPG are being refreshed, so don't reuse a cached channel list
+            self.api.invalidate_channels_cache()
         
         # Get all channels
         all_channels = self.api.get_channels()
@@ -587,12 +824,16 @@ class SyncManager:
             new_channels = set(channel_ids)
             
             # Check if multiple rules target this collection
-            rules_for_collection = [r for r in self.rule_manager.rules 
-                                   if r.get('collection_slug') == collection_slug 
-                                   and r.get('enabled', False)]
+            rules_for_collection = [r for r in self.rule_manager.get_collection_rules(collection_slug)
+                                    if r.get('enabled', False)]
             
             is_shared_collection = len(rules_for_collection) > 1
             
+            sort_order = rule.get('sort_order', 'none')
+            if sort_order != 'none':
+                # Channel details for sorting; also covers channels already in a shared collection
+                all_channel_map = self.api.channel_map_for(all_channels)
+            
             if is_shared_collection:
                 # ADDITIVE MODE: Merge with existing channels, don't remove
                 logger.info(f"⚠️ Shared collection detected! {len(rules_for_collection)} rules target '{collection.get('name')}' - using additive mode")
@@ -601,16 +842,10 @@ class SyncManager:
                 combined_channels = old_channels | new_channels
                 
                 # Apply sorting to combined set
-                sort_order = rule.get('sort_order', 'none')
                 if sort_order != 'none':
-                    # Get channel details for all combined channels
-                    all_channel_map = {ch.get('ID'): ch for ch in all_channels}
-                    combined_channel_details = [all_channel_map.get(cid) for cid in combined_channels if all_channel_map.get(cid)]
-                    channel_map = {ch.get('ID'): ch for ch in combined_channel_details}
-                    sorted_ids = self._sort_channels(list(combined_channels), channel_map, sort_order)
-                    collection['items'] = sorted_ids
+                    collection['items'] = self._sort_channels(list(combined_channels), all_channel_map, sort_order)
                 else:
-                    collection['items'] = sorted(list(combined_channels))
+                    collection['items'] = sorted(combined_channels)
                 
                 if self.api.update_collection(collection_slug, collection):
                     added = new_channels - old_channels
@@ -627,13 +862,10 @@ class SyncManager:
             else:
                 # NORMAL MODE: Replace channels (add and remove)
                 # Apply sorting
-                sort_order = rule.get('sort_order', 'none')
                 if sort_order != 'none':
-                    channel_map = {ch.get('ID'): ch for ch in matching_channels}
-                    sorted_ids = self._sort_channels(list(new_channels), channel_map, sort_order)
-                    collection['items'] = sorted_ids
+                    collection['items'] = self._sort_channels(list(new_channels), all_channel_map, sort_order)
                 else:
-                    collection['items'] = sorted(list(new_channels))
+                    collection['items'] = sorted(new_channels)
                 
                 if self.api.update_collection(collection_slug, collection):
                     added = new_channels - old_channels
@@ -653,6 +885,93 @@ class SyncManager:
             logger.error(f"Error syncing rule {rule_id}: {e}")
             return {'error': str(e)}
     
+    def _process_rule(self, rule: Dict[str, Any], matching_channels: List[Dict[str, Any]],
+                      channel_map: Dict[str, Dict[str, Any]],
+                      collections_index: Dict[str, Dict[str, Any]]) -> Tuple[str, Optional[Dict[str, Any]], Optional[Dict[str, Any]], List[str]]:
+        """Apply one rule's matched channels to its collection; returns (slug, updated collection, summary, errors)"""
+        collection_slug = rule.get('collection_slug')
+        try:
+            logger.info(f"Processing rule: {rule.get('name')} for collection {collection_slug}")
+            
+            # Use channel IDs instead of GuideNumbers
+            channel_ids = [ch.get('ID') for ch in matching_channels if ch.get('ID')]
+            
+            logger.info(f"Rule '{rule.get('name')}' matched {len(channel_ids)} channels")
+            
+            # Get current collection from the listing fetched for this sync, or fetch it on a miss
+            collection = collections_index.get(collection_slug)
+            if collection and 'items' in collection:
+                collection = dict(collection)
+            else:
+                collection = self.api.get_collection(collection_slug)
+            if not collection:
+                error_msg = f"Collection '{collection_slug}' not found in Channels DVR"
+                logger.error(error_msg)
+                return collection_slug, None, None, [error_msg]
+            
+            # Update channel list using 'items' field (not 'Channels')
+            old_items = collection.get('items', [])
+            old_list = list(dict.fromkeys(old_items))
+            old_set = set(old_list)
+            new_list = list(dict.fromkeys(channel_ids))  # de-duplicated, in matching order
+            new_set = set(new_list)
+            sorted_new = sorted(new_list)
+            
+            # Apply sorting based on rule settings
+            sort_order = rule.get('sort_order', 'none')
+            if sort_order != 'none':
+                # The sync-wide ID -> channel map covers every matched channel
+                collection['items'] = self._sort_channels(new_list, channel_map, sort_order)
+            else:
+                collection['items'] = sorted_new
+            
+            added = [cid for cid in new_list if cid not in old_set]
+            removed = [cid for cid in old_list if cid not in new_set]
+            summary = {
+                'name': collection.get('name', 'Unknown'),
+                'total': len(new_list),
+                'added': len(added),
+                'removed': len(removed),
+                'channels': sorted_new
+            }
+            
+            # Same items in the same order: nothing to write
+            if collection['items'] == old_items:
+                logger.info(f"Collection '{collection.get('name')}' unchanged, skipping update")
+                return collection_slug, None, summary, []
+            
+            # Collection is written later by sync_all in a single batch
+            return collection_slug, collection, summary, []
+        
+        except Exception as e:
+            error_msg = f"Error syncing collection {collection_slug}: {str(e)}"
+            logger.error(error_msg)
+            return collection_slug, None, None, [error_msg]
+    
+    def _refresh_autosync_rules(self, rules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Update AutoSync rules' patterns from Dispatcharr in parallel; returns the rules with updates applied"""
+        autosync_rules = [r for r in rules if r.get('dispatcharr_autosync') and r.get('_dispatcharr_group_id')]
+        if not autosync_rules:
+            return rules
+        
+        # Authenticate and load the group list once so the parallel updates share them
+        client = get_dispatcharr_client()
+        if not client or not client._ensure_authenticated():
+            logger.warning("AutoSync: Dispatcharr unavailable, proceeding with existing patterns")
+            return rules
+        client.get_enabled_groups_indexed()
+        
+        logger.info(f"AutoSync: updating {len(autosync_rules)} rule(s) from Dispatcharr")
+        with ThreadPoolExecutor(max_workers=AUTOSYNC_WORKERS) as executor:
+            futures = {executor.submit(_update_rule_patterns_from_dispatcharr, rule.get('id')): rule for rule in autosync_rules}
+            for future in as_completed(futures):
+                result = future.result()
+                if not result['success']:
+                    logger.warning(f"AutoSync update failed for '{futures[future].get('name')}': {result['message']} — proceeding with existing patterns")
+        
+        # Updated rules were replaced in the rule manager; pick up the new versions
+        return [self.rule_manager.get_rule(r.get('id')) or r for r in rules]
+    
     def sync_all(self) -> Dict[str, Any]:
         """Sync all collections based on rules"""
         logger.info("Starting sync of all collections")
@@ -664,20 +983,10 @@ class SyncManager:
         }
         
         try:
-            # Get all channels
-            logger.info("Fetching all channels from DVR...")
-            all_channels = self.api.get_channels()
-            if not all_channels:
-                error_msg = "Failed to fetch channels from DVR - check DVR_URL and connectivity"
-                logger.error(error_msg)
-                results['errors'].append(error_msg)
-                return results
-            
-            logger.info(f"Found {len(all_channels)} channels from DVR")
-            
-            # Get all rules
-            active_rules = [r for r in self.rule_manager.rules if r.get('enabled', True)]
-            logger.info(f"Processing {len(active_rules)} active rule(s) out of {len(self.rule_manager.rules)} total")
+            # Get all rules; edits made during the sync apply from the next one
+            all_rules = self.rule_manager.rules
+            active_rules = [r for r in all_rules if r.get('enabled', True)]
+            logger.info(f"Processing {len(active_rules)} active rule(s) out of {len(all_rules)} total")
             
             if len(active_rules) == 0:
                 error_msg = "No enabled rules found - create and enable at least one rule"
@@ -685,73 +994,76 @@ class SyncManager:
                 results['errors'].append(error_msg)
                 return results
             
-            # Process each rule
+            # Check which rules should run based on schedule before touching the DVR
+            scheduled_rules = []
             for rule in active_rules:
-                # Check if rule should run based on schedule
                 if not is_rule_scheduled_now(rule):
                     rule_name = rule.get('name', 'Unknown')
                     logger.info(f"Skipping rule '{rule_name}' - outside scheduled time window")
                     results['skipped'].append(rule_name)
-                    continue
-                
-                collection_slug = rule.get('collection_slug')
-                if not collection_slug:
+                else:
+                    scheduled_rules.append(rule)
+            
+            if not scheduled_rules:
+                logger.info("No rules scheduled to run now, skipping channel fetch")
+                self.last_sync = datetime.now()
+                self.last_sync_results = results
+                return results
+            
+            scheduled_rules = self._refresh_autosync_rules(scheduled_rules)
+            
+            # Get all channels, listing collections alongside so the two round trips overlap
+            logger.info("Fetching all channels from DVR...")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                collections_future = executor.submit(self.api.get_collections, True)
+                all_channels = self.api.get_channels(force_refresh=True)
+                collections = collections_future.result()
+            if not all_channels:
+                error_msg = "Failed to fetch channels from DVR - check DVR_URL and connectivity"
+                logger.error(error_msg)
+                results['errors'].append(error_msg)
+                return results
+            
+            logger.info(f"Found {len(all_channels)} channels from DVR")
+            channel_map = self.api.channel_map_for(all_channels)
+            
+            # List collections once instead of fetching each rule's collection separately
+            collections_index = {c.get('slug'): c for c in collections}
+            
+            rules_to_match = []
+            for rule in scheduled_rules:
+                if not rule.get('collection_slug'):
                     logger.warning(f"Rule '{rule.get('name')}' has no collection_slug, skipping")
                     results['errors'].append(f"Rule '{rule.get('name')}' has no collection assigned")
                     continue
-                
-                try:
-                    logger.info(f"Processing rule: {rule.get('name')} for collection {collection_slug}")
-                    
-                    # Get matching channels
-                    matching_channels = self.rule_manager.get_matching_channels(all_channels, rule)
-                    # Use channel IDs instead of GuideNumbers
-                    channel_ids = [ch.get('ID') for ch in matching_channels if ch.get('ID')]
-                    
-                    logger.info(f"Rule '{rule.get('name')}' matched {len(channel_ids)} channels")
-                    
-                    # Get current collection
-                    collection = self.api.get_collection(collection_slug)
-                    if not collection:
-                        error_msg = f"Collection '{collection_slug}' not found in Channels DVR"
-                        logger.error(error_msg)
-                        results['errors'].append(error_msg)
-                        continue
-                    
-                    # Update channel list using 'items' field (not 'Channels')
-                    old_channels = set(collection.get('items', []))
-                    new_channels = set(channel_ids)
-                    
-                    # Apply sorting based on rule settings
-                    sort_order = rule.get('sort_order', 'none')
-                    if sort_order != 'none':
-                        # Create a map of channel IDs to channel data
-                        channel_map = {ch.get('ID'): ch for ch in matching_channels}
-                        sorted_ids = self._sort_channels(list(new_channels), channel_map, sort_order)
-                        collection['items'] = sorted_ids
-                    else:
-                        collection['items'] = sorted(list(new_channels))
-                    
-                    # Update collection
-                    if self.api.update_collection(collection_slug, collection):
-                        added = new_channels - old_channels
-                        removed = old_channels - new_channels
-                        
-                        results['collections'][collection_slug] = {
-                            'name': collection.get('name', 'Unknown'),
-                            'total': len(new_channels),
-                            'added': len(added),
-                            'removed': len(removed),
-                            'channels': sorted(list(new_channels))
-                        }
-                        logger.info(f"✓ Updated collection '{collection.get('name')}': {len(new_channels)} channels (+{len(added)}, -{len(removed)})")
-                    else:
-                        error_msg = f"Failed to update collection '{collection_slug}'"
-                        logger.error(error_msg)
-                        results['errors'].append(error_msg)
-                
-                except Exception as e:
-                    error_msg = f"Error syncing collection {collection_slug}: {str(e)}"
+                rules_to_match.append(rule)
+            
+            # Match every rule up front so large rule sets can use all cores
+            matches = self.rule_manager.match_rules(rules_to_match, all_channels)
+            
+            # Build each collection's new contents in memory (no DVR I/O); the writes happen in one batch below
+            pending_updates = {}
+            summaries = {}
+            for rule, matching in zip(rules_to_match, matches):
+                collection_slug, collection, summary, errors = self._process_rule(rule, matching, channel_map, collections_index)
+                # The last rule for a collection wins, as when each rule wrote it in turn
+                if collection:
+                    pending_updates[collection_slug] = collection
+                    summaries[collection_slug] = summary
+                elif summary:
+                    # Unchanged: no write needed, and an earlier rule's pending write is moot
+                    pending_updates.pop(collection_slug, None)
+                    results['collections'][collection_slug] = summary
+                results['errors'].extend(errors)
+            
+            # Write all changed collections in one batch
+            for collection_slug, success in self.api.batch_update_collections(pending_updates).items():
+                summary = summaries[collection_slug]
+                if success:
+                    results['collections'][collection_slug] = summary
+                    logger.info(f"✓ Updated collection '{summary['name']}': {summary['total']} channels (+{summary['added']}, -{summary['removed']})")
+                else:
+                    error_msg = f"Failed to update collection '{collection_slug}'"
                     logger.error(error_msg)
                     results['errors'].append(error_msg)
             
@@ -772,6 +1084,24 @@ class SyncManager:
 api = ChannelsAPI(DVR_URL)
 rule_manager = RuleManager(CONFIG_FILE)
 sync_manager = SyncManager(api, rule_manager)
+scheduler = BackgroundScheduler()
+
+# Background tasks started by API calls, polled through /api/tasks/<task_id>
+task_executor = ThreadPoolExecutor(max_workers=TASK_WORKERS, thread_name_prefix='task')
+_tasks: Dict[str, Future] = {}
+_tasks_lock = threading.Lock()
+
+
+def submit_task(func, *args) -> str:
+    """Run func(*args) in the background and return a task ID to poll"""
+    task_id = uuid.uuid4().hex
+    with _tasks_lock:
+        # Forget the oldest finished tasks so the registry stays bounded
+        if len(_tasks) >= MAX_TRACKED_TASKS:
+            for old_id in [tid for tid, f in _tasks.items() if f.done()][:len(_tasks) - MAX_TRACKED_TASKS + 1]:
+                del _tasks[old_id]
+        _tasks[task_id] = task_executor.submit(func, *args)
+    return task_id
 
 
 # Routes
@@ -893,7 +1223,7 @@ def get_or_create_collection():
             return jsonify({'error': 'Collection name is required'}), 400
         
         # Get all existing collections directly from API
-        collections = api.get_collections()
+        collections = api.get_collections(force_refresh=True)
         
         # Check if collection with this name already exists (case-insensitive)
         # Channels DVR returns 'name' field; guard against 'title' for compatibility
@@ -913,7 +1243,7 @@ def get_or_create_collection():
         
         logger.info(f"Creating new collection '{collection_name}' at {create_url}")
         
-        response = requests.post(
+        response = api.session.post(
             create_url,
             json={'name': collection_name},
             timeout=30
@@ -922,6 +1252,7 @@ def get_or_create_collection():
         
         new_collection = response.json()
         collection_slug = new_collection.get('slug')
+        api.invalidate_collections_cache()
         
         logger.info(f"Created new collection '{collection_name}' (slug: {collection_slug})")
         
@@ -946,11 +1277,22 @@ def get_or_create_collection():
 
 @app.route('/api/collections')
 def get_collections():
-    """Get all collections"""
-    collections = api.get_collections()
+    """Get all collections (?refresh=1 bypasses the cache)"""
+    collections = api.get_collections(force_refresh=request.args.get('refresh') == '1')
     return jsonify(collections)
 
 
+def _channel_detail(channel_id: str, channel_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarize a collection item for the collection detail view"""
+    return {
+        'id': channel_id,
+        'number': channel_info.get('GuideNumber', ''),
+        'name': channel_info.get('GuideName', channel_id),
+        'callsign': channel_info.get('Callsign', ''),
+        'affiliate': channel_info.get('Affiliate', '')
+    }
+
+
 @app.route('/api/collections/<collection_slug>')
 def get_collection_detail(collection_slug):
     """Get detailed information about a specific collection"""
@@ -959,20 +1301,11 @@ def get_collection_detail(collection_slug):
         return jsonify({'error': 'Collection not found'}), 404
     
     # Get all channels to provide names for the channel IDs
-    all_channels = api.get_channels()
-    channel_map = {ch.get('ID'): ch for ch in all_channels}
+    channel_map = api.get_channel_map()
     
     # Enrich collection with channel details
-    collection_channels = []
-    for channel_id in collection.get('items', []):
-        channel_info = channel_map.get(channel_id, {})
-        collection_channels.append({
-            'id': channel_id,
-            'number': channel_info.get('GuideNumber', ''),
-            'name': channel_info.get('GuideName', channel_id),
-            'callsign': channel_info.get('Callsign', ''),
-            'affiliate': channel_info.get('Affiliate', '')
-        })
+    collection_channels = [_channel_detail(channel_id, channel_map.get(channel_id, {}))
+                           for channel_id in collection.get('items', [])]
     
     return jsonify({
         'slug': collection.get('slug'),
@@ -986,7 +1319,7 @@ def get_collection_detail(collection_slug):
 def get_sources():
     """Get all available sources/devices"""
     try:
-        response = requests.get(f"{DVR_URL}/devices")
+        response = api.session.get(f"{DVR_URL}/devices")
         devices = response.json()
         sources = [
             {
@@ -1012,14 +1345,13 @@ def preview_rule():
     # Apply sorting if specified
     sort_order = rule.get('sort_order', 'none')
     if sort_order and sort_order != 'none':
-        # Create channel map for sorting
+        # Create channel map for sorting, reused to reorder the matching channels
         channel_map = {ch.get('ID'): ch for ch in matching}
         channel_ids = [ch.get('ID') for ch in matching]
         sorted_ids = sync_manager._sort_channels(channel_ids, channel_map, sort_order)
         
         # Reorder matching channels based on sorted IDs
-        id_to_channel = {ch.get('ID'): ch for ch in matching}
-        matching = [id_to_channel[cid] for cid in sorted_ids if cid in id_to_channel]
+        matching = [channel_map[cid] for cid in sorted_ids if cid in channel_map]
     
     return jsonify({
         'total': len(matching),
@@ -1040,18 +1372,17 @@ def preview_rule():
 
 @app.route('/api/sync', methods=['POST'])
 def trigger_sync():
-    """Manually trigger a sync"""
-    results = sync_manager.sync_all()
-    return jsonify(results)
+    """Manually trigger a sync in the background; poll /api/sync/status for the results"""
+    job_id = sync_manager.submit_sync()
+    return jsonify({'job_id': job_id, 'state': 'running'}), 202
 
 
 @app.route('/api/sync/status')
 def sync_status():
-    """Get last sync results"""
-    return jsonify({
-        'last_sync': sync_manager.last_sync.isoformat() if sync_manager.last_sync else None,
-        'results': sync_manager.last_sync_results
-    })
+    """Get the background sync state and last sync results"""
+    status = sync_manager.sync_job_status()
+    status['last_sync'] = sync_manager.last_sync.isoformat() if sync_manager.last_sync else None
+    return jsonify(status)
 
 
 @app.route('/api/test-connection')
@@ -1062,102 +1393,138 @@ def test_connection():
         'tests': {}
     }
     
-    try:
-        # Test 1: Basic connectivity - try multiple endpoints
-        response = requests.get(f"{DVR_URL}/devices", timeout=5)
-        results['tests']['devices'] = {
-            'status': response.status_code,
-            'success': response.status_code == 200,
-            'data': response.json() if response.status_code == 200 else None
-        }
-        
-        # If /devices fails with 404, try alternative
-        if response.status_code == 404:
-            # Try just hitting the root
-            response = requests.get(f"{DVR_URL}/", timeout=5)
-            results['tests']['dvr_root'] = {
+    def test_devices() -> Dict[str, Any]:
+        tests = {}
+        try:
+            # Test 1: Basic connectivity - try multiple endpoints
+            response = api.session.get(f"{DVR_URL}/devices", timeout=5)
+            tests['devices'] = {
                 'status': response.status_code,
-                'success': response.status_code == 200
+                'success': response.status_code == 200,
+                'data': response.json() if response.status_code == 200 else None
             }
-    except Exception as e:
-        results['tests']['devices'] = {
-            'status': 0,
-            'success': False,
-            'error': str(e)
-        }
+            
+            # If /devices fails with 404, try alternative
+            if response.status_code == 404:
+                # Try just hitting the root
+                response = api.session.get(f"{DVR_URL}/", timeout=5)
+                tests['dvr_root'] = {
+                    'status': response.status_code,
+                    'success': response.status_code == 200
+                }
+        except Exception as e:
+            tests['devices'] = {
+                'status': 0,
+                'success': False,
+                'error': str(e)
+            }
+        return tests
     
-    try:
-        # Test 2: Collections endpoint (using correct endpoint)
-        response = requests.get(f"{DVR_URL}/dvr/collections/channels", timeout=5)
-        results['tests']['collections'] = {
-            'status': response.status_code,
-            'success': response.status_code == 200,
-            'data': response.json() if response.status_code == 200 else None
-        }
-        
-        # If this fails, note that collections are still loading via api.get_collections()
-        if response.status_code != 200:
-            # Try via our API wrapper
-            collections = api.get_collections()
-            results['tests']['collections_via_api'] = {
-                'success': len(collections) > 0,
-                'count': len(collections),
-                'note': 'Collections fetched via API wrapper despite direct endpoint failure'
+    def test_collections() -> Dict[str, Any]:
+        tests = {}
+        try:
+            # Test 2: Collections endpoint (using correct endpoint)
+            response = api.session.get(f"{DVR_URL}/dvr/collections/channels", timeout=5)
+            tests['collections'] = {
+                'status': response.status_code,
+                'success': response.status_code == 200,
+                'data': response.json() if response.status_code == 200 else None
             }
-    except Exception as e:
-        results['tests']['collections'] = {
-            'status': 0,
-            'success': False,
-            'error': str(e)
-        }
+            
+            # If this fails, note that collections are still loading via api.get_collections()
+            if response.status_code != 200:
+                # Try via our API wrapper
+                collections = api.get_collections(force_refresh=True)
+                tests['collections_via_api'] = {
+                    'success': len(collections) > 0,
+                    'count': len(collections),
+                    'note': 'Collections fetched via API wrapper despite direct endpoint failure'
+                }
+        except Exception as e:
+            tests['collections'] = {
+                'status': 0,
+                'success': False,
+                'error': str(e)
+            }
+        return tests
     
-    try:
-        # Test 3: Channels
-        channels = api.get_channels()
-        results['tests']['channels'] = {
-            'success': len(channels) > 0,
-            'count': len(channels)
-        }
-    except Exception as e:
-        results['tests']['channels'] = {
-            'success': False,
-            'error': str(e)
-        }
+    def test_channels() -> Dict[str, Any]:
+        try:
+            # Test 3: Channels
+            channels = api.get_channels(force_refresh=True)
+            return {'channels': {
+                'success': len(channels) > 0,
+                'count': len(channels)
+            }}
+        except Exception as e:
+            return {'channels': {
+                'success': False,
+                'error': str(e)
+            }}
+    
+    # The checks are independent, so run them at the same time and report them in order
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        for tests in executor.map(lambda test: test(), [test_devices, test_collections, test_channels]):
+            results['tests'].update(tests)
     
     return jsonify(results)
 
 
+# Encoded rule lists are kept in memory per group and dropped when the rules change,
+# so repeat downloads only pay for the small export header
+_EXPORT_RUN_ID = uuid.uuid4().hex[:8]  # rules versions restart at 0 with every process
+_export_cache: Dict[str, Tuple[int, int, bytes]] = {}  # group key -> (rules version, rule count, encoded rules)
+
+
+def _export_group_key(group_filter: Optional[str]) -> str:
+    """Cache key for an export's group filter"""
+    if group_filter and group_filter != 'all':
+        # Hash the group name so arbitrary user input never ends up in a header
+        return hashlib.sha1(group_filter.encode('utf-8')).hexdigest()[:16]
+    return 'all'
+
+
 @app.route('/api/export', methods=['GET'])
 def export_rules():
     """Export all rules or specific groups as JSON"""
     try:
         group_filter = request.args.get('group')
-        rules_to_export = rule_manager.rules
-        
-        if group_filter and group_filter != 'all':
-            rules_to_export = [r for r in rules_to_export if r.get('group') == group_filter]
-        
-        export_data = {
-            'version': '1.2.0',
-            'exported_at': datetime.now().isoformat(),
-            'rules_count': len(rules_to_export),
-            'rules': rules_to_export
-        }
+        group_key = _export_group_key(group_filter)
+        rules_version = rule_manager.rules_version
         
-        # Create in-memory file
-        json_data = json.dumps(export_data, indent=2)
-        buffer = BytesIO(json_data.encode('utf-8'))
-        buffer.seek(0)
+        # Reuse the encoded rules until they change
+        cached = _export_cache.get(group_key)
+        if cached and cached[0] == rules_version:
+            _, rules_count, rules_json = cached
+        else:
+            rules_to_export = rule_manager.rules
+            if group_filter and group_filter != 'all':
+                rules_to_export = [r for r in rules_to_export if r.get('group') == group_filter]
+            rules_count = len(rules_to_export)
+            # Indented one level, as it sits under "rules" in the export object
+            rules_json = orjson.dumps(rules_to_export, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n  ')
+            if any(entry[0] != rules_version for entry in _export_cache.values()):
+                _export_cache.clear()
+            _export_cache[group_key] = (rules_version, rules_count, rules_json)
+        
+        # Same layout as orjson.dumps(export_data, option=OPT_INDENT_2), with a fresh timestamp
+        export_json = (
+            b'{\n  "version": "1.2.0",\n  "exported_at": ' + orjson.dumps(datetime.now().isoformat())
+            + b',\n  "rules_count": ' + str(rules_count).encode()
+            + b',\n  "rules": ' + rules_json + b'\n}'
+        )
         
         filename = f"channels-rules-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
         if group_filter and group_filter != 'all':
             filename = f"channels-rules-{group_filter}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
         
         return send_file(
-            buffer,
+            BytesIO(export_json),
             mimetype='application/json',
             as_attachment=True,
-            download_name=filename
+            download_name=filename,
+            etag=f"rules-{_EXPORT_RUN_ID}-{rules_version}-{group_key}",
+            conditional=True
         )
     except Exception as e:
         logger.error(f"Export error: {e}")
@@ -1176,8 +1543,7 @@ def import_rules():
             return jsonify({'error': 'No file selected'}), 400
         
         # Read and parse JSON
-        content = file.read().decode('utf-8')
-        import_data = json.loads(content)
+        import_data = orjson.loads(file.read())
         
         if 'rules' not in import_data:
             return jsonify({'error': 'Invalid export file format'}), 400
@@ -1187,15 +1553,14 @@ def import_rules():
         
         if mode == 'replace':
             rule_manager.rules = imported_rules
+            rule_manager.save_rules()
+            setup_rule_schedulers()
         else:  # merge
-            # Generate new IDs for imported rules to avoid conflicts
-            import uuid
-            for rule in imported_rules:
-                rule['id'] = str(uuid.uuid4())
-            rule_manager.rules.extend(imported_rules)
-        
-        rule_manager.save_rules()
-        setup_rule_schedulers()
+            # New IDs avoid conflicts with existing rules
+            rule_manager.add_rules(imported_rules)
+            # Existing jobs are unaffected; only reschedule if an imported rule has its own interval
+            if any(r.get('enabled') and r.get('sync_interval_minutes') for r in imported_rules):
+                setup_rule_schedulers()
         
         return jsonify({
             'success': True,
@@ -1212,28 +1577,43 @@ def import_rules():
 def get_groups():
     """Get all unique rule groups"""
     try:
-        groups = set()
-        for rule in rule_manager.rules:
-            group = rule.get('group', 'ungrouped')
-            if group:
-                groups.add(group)
-        
-        return jsonify(sorted(list(groups)))
+        return jsonify(rule_manager.get_groups())
     except Exception as e:
         logger.error(f"Error getting groups: {e}")
         return jsonify({'error': str(e)}), 500
 
 
+# Parsed templates file, reused until the file's mtime changes
+_templates_cache: Dict[str, Any] = {'mtime_ns': None, 'data': []}
+
+
+def load_templates() -> Optional[List[Dict[str, Any]]]:
+    """Load templates from disk, or None if the templates file doesn't exist"""
+    try:
+        mtime_ns = os.stat(TEMPLATES_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    
+    if _templates_cache['mtime_ns'] != mtime_ns:
+        with open(TEMPLATES_FILE, 'rb') as f:
+            _templates_cache['data'] = orjson.loads(f.read())
+        _templates_cache['mtime_ns'] = mtime_ns
+    return list(_templates_cache['data'])
+
+
+def save_templates(templates: List[Dict[str, Any]]):
+    """Write templates to disk and refresh the cache so the next read skips the parse"""
+    with open(TEMPLATES_FILE, 'wb') as f:
+        f.write(orjson.dumps(templates, option=orjson.OPT_INDENT_2))
+    _templates_cache['data'] = templates
+    _templates_cache['mtime_ns'] = os.stat(TEMPLATES_FILE).st_mtime_ns
+
+
 @app.route('/api/templates', methods=['GET'])
 def get_templates():
     """Get all rule templates"""
     try:
-        templates_file = '/config/templates.json'
-        if os.path.exists(templates_file):
-            with open(templates_file, 'r') as f:
-                templates = json.load(f)
-            return jsonify(templates)
-        return jsonify([])
+        return jsonify(load_templates() or [])
     except Exception as e:
         logger.error(f"Error loading templates: {e}")
         return jsonify({'error': str(e)}), 500
@@ -1246,11 +1626,7 @@ def save_template():
         template_data = request.json
         
         # Load existing templates
-        templates_file = '/config/templates.json'
-        templates = []
-        if os.path.exists(templates_file):
-            with open(templates_file, 'r') as f:
-                templates = json.load(f)
+        templates = load_templates() or []
         
         # Add new template
         template_data['id'] = str(uuid.uuid4())
@@ -1258,8 +1634,7 @@ def save_template():
         templates.append(template_data)
         
         # Save
-        with open(templates_file, 'w') as f:
-            json.dump(templates, f, indent=2)
+        save_templates(templates)
         
         return jsonify(template_data)
     except Exception as e:
@@ -1271,17 +1646,13 @@ def save_template():
 def delete_template(template_id):
     """Delete a template"""
     try:
-        templates_file = '/config/templates.json'
-        if not os.path.exists(templates_file):
+        templates = load_templates()
+        if templates is None:
             return jsonify({'error': 'No templates found'}), 404
         
-        with open(templates_file, 'r') as f:
-            templates = json.load(f)
-        
         templates = [t for t in templates if t['id'] != template_id]
         
-        with open(templates_file, 'w') as f:
-            json.dump(templates, f, indent=2)
+        save_templates(templates)
         
         return jsonify({'success': True})
     except Exception as e:
@@ -1293,12 +1664,42 @@ def delete_template(template_id):
 # Dispatcharr Integration Routes
 # ============================================================================
 
+# Parsed Dispatcharr config (and its token expiry as a datetime), reused until the file's mtime changes
+_dispatcharr_config_cache: Dict[str, Any] = {'mtime_ns': None, 'data': None, 'token_expires_at': None}
+_dispatcharr_config_lock = threading.Lock()
+
+
+def _parse_token_expiry(config: Dict[str, Any]) -> Optional[datetime]:
+    """Parse the saved token expiry, or None if it's missing or malformed"""
+    try:
+        return datetime.fromisoformat(config['token_expires_at']) if config.get('token_expires_at') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _normalize_dispatcharr_config(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce the connection settings to clean values once, so callers can index them directly"""
+    config = dict(raw)
+    config['enabled'] = bool(raw.get('enabled'))
+    config['url'] = (raw.get('url') or '').rstrip('/')
+    config['username'] = raw.get('username') or ''
+    config['password'] = raw.get('password') or ''
+    return config
+
+
 def load_dispatcharr_config() -> Dict[str, Any]:
     """Load Dispatcharr configuration from file"""
     try:
         if os.path.exists(DISPATCHARR_CONFIG_FILE):
-            with open(DISPATCHARR_CONFIG_FILE, 'r') as f:
-                return json.load(f)
+            mtime_ns = os.stat(DISPATCHARR_CONFIG_FILE).st_mtime_ns
+            with _dispatcharr_config_lock:
+                if _dispatcharr_config_cache['mtime_ns'] != mtime_ns:
+                    with open(DISPATCHARR_CONFIG_FILE, 'rb') as f:
+                        _dispatcharr_config_cache['data'] = _normalize_dispatcharr_config(orjson.loads(f.read()))
+                    _dispatcharr_config_cache['token_expires_at'] = _parse_token_expiry(_dispatcharr_config_cache['data'])
+                    _dispatcharr_config_cache['mtime_ns'] = mtime_ns
+                # Callers edit the returned config before saving it, so hand out a copy
+                return copy.deepcopy(_dispatcharr_config_cache['data'])
     except Exception as e:
         logger.error(f"Error loading Dispatcharr config: {e}")
     
@@ -1314,24 +1715,51 @@ def load_dispatcharr_config() -> Dict[str, Any]:
 def save_dispatcharr_config(config: Dict[str, Any]) -> bool:
     """Save Dispatcharr configuration to file"""
     try:
-        with open(DISPATCHARR_CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=2)
+        # Atomic, so the mtime-keyed cache never loads a half-written file
+        if write_file_atomic(DISPATCHARR_CONFIG_FILE, orjson.dumps(config, option=orjson.OPT_INDENT_2)):
+            # Force a re-read even if the write landed within the filesystem's mtime granularity
+            with _dispatcharr_config_lock:
+                _dispatcharr_config_cache['mtime_ns'] = None
         return True
     except Exception as e:
         logger.error(f"Error saving Dispatcharr config: {e}")
         return False
 
 
+# Shared Dispatcharr client, reused (with its tokens) until the credentials change
+_dispatcharr_client_cache: Dict[str, Any] = {'key': None, 'client': None}
+_dispatcharr_client_lock = threading.Lock()
+
+
+def reset_dispatcharr_client():
+    """Drop the shared Dispatcharr client so the next call builds one from the saved config"""
+    with _dispatcharr_client_lock:
+        _dispatcharr_client_cache['key'] = None
+        _dispatcharr_client_cache['client'] = None
+
+
 def get_dispatcharr_client() -> Optional[DispatcharrClient]:
     """Get configured Dispatcharr client or None if not configured"""
     config = load_dispatcharr_config()
     
-    if not config.get('enabled', False):
+    if not config['enabled']:
         return None
     
-    if not all([config.get('url'), config.get('username'), config.get('password')]):
+    if not (config['url'] and config['username'] and config['password']):
         return None
     
+    key = (config['url'], config['username'], config['password'])
+    with _dispatcharr_client_lock:
+        if _dispatcharr_client_cache['key'] == key:
+            return _dispatcharr_client_cache['client']
+        client = _build_dispatcharr_client(config)
+        _dispatcharr_client_cache['key'] = key
+        _dispatcharr_client_cache['client'] = client
+        return client
+
+
+def _build_dispatcharr_client(config: Dict[str, Any]) -> DispatcharrClient:
+    """Create a Dispatcharr client, restoring tokens saved in the config"""
     client = DispatcharrClient(
         base_url=config['url'],
         username=config['username'],
@@ -1342,12 +1770,12 @@ def get_dispatcharr_client() -> Optional[DispatcharrClient]:
     if config.get('access_token') and config.get('refresh_token'):
         client.access_token = config['access_token']
         client.refresh_token = config['refresh_token']
-        if config.get('token_expires_at'):
-            try:
-                client.token_expires_at = datetime.fromisoformat(config['token_expires_at'])
-                logger.info("Restored cached Dispatcharr tokens")
-            except:
-                pass
+        # Parsed once when the config file was loaded
+        with _dispatcharr_config_lock:
+            token_expires_at = _dispatcharr_config_cache['token_expires_at']
+        if token_expires_at:
+            client.token_expires_at = token_expires_at
+            logger.info("Restored cached Dispatcharr tokens")
     
     return client
 
@@ -1359,10 +1787,10 @@ def get_dispatcharr_config():
         config = load_dispatcharr_config()
         # Don't send password to frontend
         safe_config = {
-            'enabled': config.get('enabled', False),
-            'url': config.get('url', ''),
-            'username': config.get('username', ''),
-            'has_password': bool(config.get('password', ''))
+            'enabled': config['enabled'],
+            'url': config['url'],
+            'username': config['username'],
+            'has_password': bool(config['password'])
         }
         return jsonify(safe_config)
     except Exception as e:
@@ -1390,6 +1818,7 @@ def save_dispatcharr_config_route():
         
         # Save config
         if save_dispatcharr_config(config):
+            reset_dispatcharr_client()
             return jsonify({'success': True, 'message': 'Configuration saved'})
         else:
             return jsonify({'error': 'Failed to save configuration'}), 500
@@ -1413,8 +1842,7 @@ def test_dispatcharr_connection():
         
         # If placeholder sent, use stored password
         if password == '__USE_STORED__':
-            config = load_dispatcharr_config()
-            password = config.get('password', '')
+            password = load_dispatcharr_config()['password']
             logger.info("Using stored password for test")
         else:
             logger.info(f"Password length: {len(password)}")
@@ -1456,12 +1884,8 @@ def get_dispatcharr_groups():
         # Get enabled groups
         groups = client.get_enabled_groups()
 
-        # Build set of group IDs that already have an AutoSync rule
-        autosync_group_ids = {
-            r['_dispatcharr_group_id']
-            for r in rule_manager.rules
-            if r.get('dispatcharr_autosync') and r.get('_dispatcharr_group_id')
-        }
+        # Group IDs that already have an AutoSync rule
+        autosync_group_ids = rule_manager.autosync_group_ids
 
         # Annotate each group with has_autosync_rule flag
         for group in groups:
@@ -1482,35 +1906,140 @@ def generate_channel_pattern(channel_numbers):
     if not channel_numbers:
         return ''
     
-    # Sort numbers and ensure they're integers
-    sorted_nums = sorted([int(n) for n in channel_numbers])
+    # Sort unique numbers as integers (Dispatcharr usually sends ints already).
+    # Channels sharing a number would otherwise split a range, e.g. "101,101-103"
+    sorted_nums = sorted({n if isinstance(n, int) else int(n) for n in channel_numbers})
     
-    # Group consecutive numbers into ranges
+    # Consecutive numbers share the same (value - position), so each run groups together
     ranges = []
-    range_start = sorted_nums[0]
-    range_end = sorted_nums[0]
-    
-    for i in range(1, len(sorted_nums) + 1):
-        if i < len(sorted_nums) and sorted_nums[i] == range_end + 1:
-            # Consecutive number, extend range
-            range_end = sorted_nums[i]
+    for _, run in groupby(enumerate(sorted_nums), key=lambda item: item[1] - item[0]):
+        run = list(run)
+        range_start = run[0][1]
+        range_end = run[-1][1]
+        if range_start == range_end:
+            # Single number
+            ranges.append(str(range_start))
         else:
-            # Gap or end of array, close current range
-            if range_start == range_end:
-                # Single number
-                ranges.append(str(range_start))
-            else:
-                # Range
-                ranges.append(f"{range_start}-{range_end}")
-            
-            # Start new range
-            if i < len(sorted_nums):
-                range_start = sorted_nums[i]
-                range_end = sorted_nums[i]
+            # Range
+            ranges.append(f"{range_start}-{range_end}")
     
     return ','.join(ranges)
 
 
+def _filter_group_channels(all_channels: List[Any], group_id: int) -> List[Tuple[Any, str, Optional[int]]]:
+    """
+    Keep only channels that EXACTLY match group_id (the API parameter might return more than we want).
+    Returns (channel_number, name, streams_count) tuples; streams_count is None if the channel has no stream list.
+    """
+    rows = []
+    for channel in all_channels:
+        if not isinstance(channel, dict) or channel.get('channel_group_id') != group_id:
+            continue
+        channel_streams = channel.get('streams', [])
+        rows.append((
+            channel.get('channel_number'),
+            channel.get('name', 'Unknown'),
+            len(channel_streams) if isinstance(channel_streams, list) else None
+        ))
+    return rows
+
+
+def _fetch_group_channels(group_id: int, client: DispatcharrClient,
+                          groups_by_id: Optional[Dict[int, Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+    """Get actual channel assignments for a Dispatcharr group, or None if the group isn't enabled"""
+    # Get all enabled groups to find M3U account name
+    if groups_by_id is None:
+        _, groups_by_id = client.get_enabled_groups_indexed()
+    target_group = groups_by_id.get(group_id)
+    
+    if not target_group:
+        return None
+    
+    group_name = target_group['name']
+    m3u_account_name = target_group.get('m3u_account_name', '')
+    is_local_group = target_group.get('m3u_account_count', 0) == 0
+    
+    logger.debug("Looking up channels for group: %s, Type: %s", group_name, 'Local' if is_local_group else 'Provider')
+    
+    # Get streams for this group
+    streams_url = f"{client.base_url}/api/channels/streams/"
+    
+    if is_local_group:
+        # Local groups: search by channel_group parameter
+        params = {
+            'channel_group': group_id
+        }
+        logger.debug("Fetching streams for local group by channel_group=%s", group_id)
+    else:
+        # Provider groups: search by group name and M3U account
+        params = {
+            'channel_group_name': group_name,
+            'm3u_account_name': m3u_account_name
+        }
+        logger.debug("Fetching streams for provider group: %s, M3U account: %s", group_name, m3u_account_name)
+    
+    # Get channels directly by channel_group_id
+    channels_url = f"{client.base_url}/api/channels/channels/"
+    channels_params = {'channel_group_id': group_id}
+    
+    # The streams and channels lookups are independent, so fetch them together
+    headers = client._get_headers()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        streams_future = executor.submit(client.session.get, streams_url, headers=headers, params=params, timeout=30)
+        channels_future = executor.submit(client.session.get, channels_url, headers=headers, params=channels_params, timeout=30)
+        streams_response = streams_future.result()
+        channels_response = channels_future.result()
+    
+    streams_response.raise_for_status()
+    # Only the number of streams is reported
+    total_streams = len(orjson.loads(streams_response.content).get('results', []))
+    
+    logger.debug("Found %s streams in group", total_streams)
+    
+    channels_response.raise_for_status()
+    channels_data = orjson.loads(channels_response.content)
+    
+    # Check if it's a list or paginated response
+    if isinstance(channels_data, dict):
+        # Paginated response
+        all_channels = channels_data.get('results', [])
+        logger.debug("Retrieved %s channels from API", len(all_channels))
+    elif isinstance(channels_data, list):
+        # Direct list response
+        all_channels = channels_data
+        logger.debug("Retrieved %s channels from API", len(all_channels))
+    else:
+        logger.error(f"Unexpected response type: {type(channels_data)}")
+        all_channels = []
+    
+    # Only channels with a stream list count as assigned
+    rows = [row for row in _filter_group_channels(all_channels, group_id) if row[2] is not None]
+    
+    logger.debug("Filtered to %s channels that exactly match group_id=%s", len(rows), group_id)
+    
+    # Sort by channel number
+    rows.sort(key=lambda row: row[0] if row[0] is not None else 999999)
+    
+    matched_channels = [
+        {'channel_number': number, 'name': name, 'streams_count': streams_count}
+        for number, name, streams_count in rows
+    ]
+    
+    # Generate smart pattern
+    channel_nums = [number for number, _, _ in rows if number is not None]
+    smart_pattern = generate_channel_pattern(channel_nums)
+    
+    logger.info("Found %s channels with streams from group %s, pattern: %s", len(matched_channels), group_name, smart_pattern)
+    
+    return {
+        'group_name': group_name,
+        'total_streams': total_streams,
+        'assigned_channels_count': len(matched_channels),
+        'channels': matched_channels,
+        'smart_pattern': smart_pattern
+    }
+
+
 @app.route('/api/dispatcharr/groups/<int:group_id>/channels', methods=['GET'])
 def get_dispatcharr_group_channels(group_id):
     """Get actual channel assignments for a Dispatcharr group"""
@@ -1523,110 +2052,11 @@ def get_dispatcharr_group_channels(group_id):
         if not client._ensure_authenticated():
             return jsonify({'error': 'Authentication failed'}), 401
         
-        # Get all enabled groups to find M3U account name
-        enabled_groups = client.get_enabled_groups()
-        target_group = None
-        for g in enabled_groups:
-            if g['id'] == group_id:
-                target_group = g
-                break
-        
-        if not target_group:
+        channels_data = _fetch_group_channels(group_id, client)
+        if channels_data is None:
             return jsonify({'error': 'Group not found or not enabled'}), 404
         
-        group_name = target_group['name']
-        m3u_account_name = target_group.get('m3u_account_name', '')
-        is_local_group = target_group.get('m3u_account_count', 0) == 0
-        
-        logger.info(f"Looking up channels for group: {group_name}, Type: {'Local' if is_local_group else 'Provider'}")
-        
-        # Get streams for this group
-        streams_url = f"{client.base_url}/api/channels/streams/"
-        
-        if is_local_group:
-            # Local groups: search by channel_group parameter
-            params = {
-                'channel_group': group_id
-            }
-            logger.info(f"Fetching streams for local group by channel_group={group_id}")
-        else:
-            # Provider groups: search by group name and M3U account
-            params = {
-                'channel_group_name': group_name,
-                'm3u_account_name': m3u_account_name
-            }
-            logger.info(f"Fetching streams for provider group: {group_name}, M3U account: {m3u_account_name}")
-        
-        response = requests.get(streams_url, headers=client._get_headers(), params=params, timeout=30)
-        response.raise_for_status()
-        
-        streams_data = response.json()
-        stream_ids = [s['id'] for s in streams_data.get('results', [])]
-        
-        logger.info(f"Found {len(stream_ids)} streams in group")
-        
-        # Get channels directly by channel_group_id
-        channels_url = f"{client.base_url}/api/channels/channels/"
-        channels_params = {'channel_group_id': group_id}
-        
-        response = requests.get(channels_url, headers=client._get_headers(), params=channels_params, timeout=30)
-        response.raise_for_status()
-        
-        channels_data = response.json()
-        
-        # Check if it's a list or paginated response
-        if isinstance(channels_data, dict):
-            # Paginated response
-            all_channels = channels_data.get('results', [])
-            logger.info(f"Retrieved {len(all_channels)} channels from API")
-        elif isinstance(channels_data, list):
-            # Direct list response
-            all_channels = channels_data
-            logger.info(f"Retrieved {len(all_channels)} channels from API")
-        else:
-            logger.error(f"Unexpected response type: {type(channels_data)}")
-            all_channels = []
-        
-        # Filter to only channels that EXACTLY match this group_id
-        # (the API parameter might return more than we want)
-        matched_channels = []
-        for channel in all_channels:
-            if not isinstance(channel, dict):
-                continue
-            
-            # Check if this channel's channel_group_id matches our group_id
-            if channel.get('channel_group_id') != group_id:
-                continue
-                
-            channel_streams = channel.get('streams', [])
-            if not isinstance(channel_streams, list):
-                continue
-            
-            matched_channels.append({
-                'channel_number': channel.get('channel_number'),
-                'name': channel.get('name', 'Unknown'),
-                'streams_count': len(channel_streams)
-            })
-        
-        logger.info(f"Filtered to {len(matched_channels)} channels that exactly match group_id={group_id}")
-        
-        # Sort by channel number
-        matched_channels.sort(key=lambda x: x['channel_number'] if x['channel_number'] is not None else 999999)
-        
-        # Generate smart pattern
-        channel_nums = [c['channel_number'] for c in matched_channels if c['channel_number'] is not None]
-        smart_pattern = generate_channel_pattern(channel_nums)
-        
-        logger.info(f"Found {len(matched_channels)} channels with streams from group {group_name}")
-        logger.info(f"Generated pattern: {smart_pattern}")
-        
-        return jsonify({
-            'group_name': group_name,
-            'total_streams': len(stream_ids),
-            'assigned_channels_count': len(matched_channels),
-            'channels': matched_channels,
-            'smart_pattern': smart_pattern
-        })
+        return jsonify(channels_data)
         
     except Exception as e:
         logger.error(f"Error getting group channels: {e}")
@@ -1645,12 +2075,8 @@ def create_rule_from_dispatcharr_group(group_id):
             return jsonify({'error': 'Dispatcharr not configured'}), 400
         
         # Get enabled groups to find this one
-        enabled_groups = client.get_enabled_groups()
-        target_group = None
-        for g in enabled_groups:
-            if g['id'] == group_id:
-                target_group = g
-                break
+        _, groups_by_id = client.get_enabled_groups_indexed()
+        target_group = groups_by_id.get(group_id)
         
         if not target_group:
             return jsonify({'error': 'Group not found or not enabled'}), 404
@@ -1659,9 +2085,10 @@ def create_rule_from_dispatcharr_group(group_id):
         
         # Try to get actual channel assignments
         try:
-            # Reuse the channel lookup logic
-            channels_response = get_dispatcharr_group_channels(group_id)
-            channels_data = channels_response.json
+            # Reuse the channel lookup logic with the groups already fetched
+            channels_data = None
+            if client._ensure_authenticated():
+                channels_data = _fetch_group_channels(group_id, client, groups_by_id)
             
             if channels_data and 'smart_pattern' in channels_data and channels_data['smart_pattern']:
                 # Use the smart pattern from actual channel assignments
@@ -1676,7 +2103,7 @@ def create_rule_from_dispatcharr_group(group_id):
             pattern = group_name
         
         # Determine match type based on pattern
-        is_number_pattern = any(char.isdigit() for char in pattern)
+        is_number_pattern = _HAS_DIGIT_RE.search(pattern) is not None
         
         # Create rule structure
         rule_data = {
@@ -1718,13 +2145,18 @@ def create_rule_from_dispatcharr_group(group_id):
         return jsonify({'error': str(e)}), 500
 
 
-def _update_rule_patterns_from_dispatcharr(rule: Dict[str, Any]) -> Dict[str, Any]:
+def _update_rule_patterns_from_dispatcharr(rule_id: str) -> Dict[str, Any]:
     """
     Fetch the latest channel numbers for a Dispatcharr-linked rule and update
     its patterns in rule_manager.
 
     Returns a dict with 'success', 'message', and optionally 'patterns'.
     """
+    # Read the rule when the work runs, not when it was queued
+    rule = rule_manager.get_rule(rule_id)
+    if not rule:
+        return {'success': False, 'message': 'Rule not found'}
+
     group_id = rule.get('_dispatcharr_group_id')
     if not group_id:
         return {'success': False, 'message': 'Rule has no _dispatcharr_group_id'}
@@ -1737,8 +2169,8 @@ def _update_rule_patterns_from_dispatcharr(rule: Dict[str, Any]) -> Dict[str, An
         return {'success': False, 'message': 'Dispatcharr authentication failed'}
 
     try:
-        enabled_groups = client.get_enabled_groups()
-        target_group = next((g for g in enabled_groups if g['id'] == group_id), None)
+        _, groups_by_id = client.get_enabled_groups_indexed()
+        target_group = groups_by_id.get(group_id)
         if not target_group:
             return {'success': False, 'message': f'Dispatcharr group {group_id} not found or not enabled'}
 
@@ -1748,22 +2180,14 @@ def _update_rule_patterns_from_dispatcharr(rule: Dict[str, Any]) -> Dict[str, An
 
         # Fetch channels by group
         channels_url = f"{client.base_url}/api/channels/channels/"
-        channels_response = requests.get(channels_url, headers=client._get_headers(),
-                                         params={'channel_group_id': group_id}, timeout=30)
+        channels_response = client.session.get(channels_url, headers=client._get_headers(),
+                                                params={'channel_group_id': group_id}, timeout=30)
         channels_response.raise_for_status()
 
-        channels_data = channels_response.json()
+        channels_data = orjson.loads(channels_response.content)
         all_channels = channels_data.get('results', []) if isinstance(channels_data, dict) else channels_data
 
-        channel_nums = []
-        for ch in all_channels:
-            if not isinstance(ch, dict):
-                continue
-            if ch.get('channel_group_id') != group_id:
-                continue
-            num = ch.get('channel_number')
-            if num is not None:
-                channel_nums.append(num)
+        channel_nums = [number for number, _, _ in _filter_group_channels(all_channels, group_id) if number is not None]
 
         if not channel_nums:
             return {'success': False, 'message': f'No channels found in Dispatcharr group "{group_name}"'}
@@ -1772,15 +2196,14 @@ def _update_rule_patterns_from_dispatcharr(rule: Dict[str, Any]) -> Dict[str, An
         logger.info(f"AutoSync: group '{group_name}' -> pattern '{smart_pattern}'")
 
         # Update the rule patterns
-        rule_id = rule.get('id')
-        updated_rule = {**rule, 'patterns': [smart_pattern], 'match_types': ['number']}
-        if rule_manager.update_rule(rule_id, updated_rule):
+        if rule_manager.update_rule_patterns(rule_id, [smart_pattern], ['number']):
             return {'success': True, 'message': f'Updated patterns to {smart_pattern}', 'patterns': [smart_pattern]}
-        else:
-            return {'success': False, 'message': 'Failed to save updated rule patterns'}
+        if rule_manager.get_rule(rule_id) is None:
+            return {'success': False, 'message': 'Rule was deleted'}
+        return {'success': False, 'message': 'Failed to save updated rule patterns'}
 
     except Exception as e:
-        logger.error(f"AutoSync update failed for rule {rule.get('id')}: {e}")
+        logger.error(f"AutoSync update failed for rule {rule_id}: {e}")
         return {'success': False, 'message': str(e)}
 
 
@@ -1788,25 +2211,38 @@ def _update_rule_patterns_from_dispatcharr(rule: Dict[str, Any]) -> Dict[str, An
 def update_rule_from_dispatcharr(rule_id):
     """Fetch latest channel numbers from Dispatcharr and update rule patterns"""
     try:
-        rule = next((r for r in rule_manager.rules if r.get('id') == rule_id), None)
+        rule = rule_manager.get_rule(rule_id)
         if not rule:
             return jsonify({'error': 'Rule not found'}), 404
 
         if not rule.get('dispatcharr_autosync'):
             return jsonify({'error': 'Rule does not have AutoSync enabled'}), 400
 
-        result = _update_rule_patterns_from_dispatcharr(rule)
-
-        if result['success']:
-            return jsonify(result)
-        else:
-            return jsonify({'error': result['message']}), 400
+        # Dispatcharr lookups can be slow; poll /api/tasks/<task_id> for the result
+        task_id = submit_task(_update_rule_patterns_from_dispatcharr, rule_id)
+        return jsonify({'task_id': task_id, 'state': 'running'}), 202
 
     except Exception as e:
         logger.error(f"Error in update-from-dispatcharr for rule {rule_id}: {e}")
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/tasks/<task_id>', methods=['GET'])
+def get_task_status(task_id):
+    """Get the state of a background task and its result once finished"""
+    with _tasks_lock:
+        future = _tasks.get(task_id)
+    if future is None:
+        return jsonify({'error': 'Task not found'}), 404
+    if not future.done():
+        return jsonify({'task_id': task_id, 'state': 'running'})
+    try:
+        return jsonify({'task_id': task_id, 'state': 'done', 'result': future.result()})
+    except Exception as e:
+        logger.error(f"Background task {task_id} failed: {e}")
+        return jsonify({'task_id': task_id, 'state': 'error', 'error': str(e)})
+
+
 def scheduled_sync():
     """Scheduled sync job"""
     with app.app_context():
@@ -1816,7 +2252,10 @@ def scheduled_sync():
 
 def setup_rule_schedulers():
     """Setup individual schedulers for rules with custom sync intervals"""
-    scheduler.remove_all_jobs()
+    # Only replace the interval jobs; pending one-shot jobs (refresh_*, initial_sync) must still run
+    for job in scheduler.get_jobs():
+        if job.id.startswith('rule_sync_'):
+            job.remove()
 
     # Use effective sync interval (settings file overrides env var)
     effective_interval = get_sync_interval()
@@ -1857,17 +2296,28 @@ def setup_rule_schedulers():
             logger.info(f"Scheduled rule '{rule.get('name')}' to sync every {interval} minutes")
 
 
-if __name__ == '__main__':
+def start_background_jobs():
+    """Start the scheduler, register sync jobs and queue the initial sync"""
     # Start scheduler
-    scheduler = BackgroundScheduler()
     scheduler.start()
     
     # Setup all sync jobs (global + per-rule)
     setup_rule_schedulers()
     
-    # Run initial sync
+    # Run initial sync as a one-shot job so the web server can start serving straight away
     logger.info("Running initial sync")
-    sync_manager.sync_all()
+    scheduler.add_job(
+        func=scheduled_sync,
+        trigger='date',
+        run_date=datetime.now(),
+        id='initial_sync',
+        name='Initial sync',
+        replace_existing=True
+    )
+
+
+if __name__ == '__main__':
+    start_background_jobs()
     
-    # Start Flask app
+    # Start Flask app (development server; the Docker image runs gunicorn, see gunicorn.conf.py)
     app.run(host='0.0.0.0', port=5000, debug=False)
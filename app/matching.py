@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Rule matching
+Compiles rule patterns and matches them against DVR channels. Kept free of import-time
+side effects so spawned matching processes can import it without loading the web app.
+"""
+import re
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Numbered backreferences and group conditionals, which break once patterns are joined and renumbered
+_GROUP_REF_RE = re.compile(r'\\[1-9]|\(\?\(\d')
+
+# Pattern kinds returned by _classify_pattern
+_NUM_SINGLE = 'number'
+_NUM_RANGE = 'range'
+_REGEX = 'regex'
+
+# Channel fields read by match_prepared; the rest is not sent to matching processes
+_MATCH_FIELDS = ('_device_id', 'GuideNumber', 'GuideName', 'Callsign', 'Affiliate')
+
+
+def _classify_pattern(pattern: str) -> Tuple[str, Any]:
+    """
+    Classify a rule pattern once, before matching
+    Returns (_NUM_SINGLE, float), (_NUM_RANGE, (start, end)) or (_REGEX, None);
+    the value is None when a numeric-looking pattern can't be parsed
+    """
+    digits = pattern.replace('.', '')
+    
+    # Single number (e.g., "115")
+    if digits.isdigit():
+        try:
+            return _NUM_SINGLE, float(pattern)
+        except ValueError:
+            return _NUM_SINGLE, None
+    
+    # Channel number range (e.g., "100-200")
+    if '-' in pattern and digits.replace('-', '').isdigit():
+        parts = pattern.split('-')
+        if len(parts) == 2:
+            try:
+                return _NUM_RANGE, (float(parts[0]), float(parts[1]))
+            except ValueError:
+                pass
+        return _NUM_RANGE, None
+    
+    return _REGEX, None
+
+
+def _compile_patterns(patterns: List[str]) -> List[re.Pattern]:
+    """Compile patterns into a single alternation regex, keeping numbered-group patterns separate"""
+    separate = [p for p in patterns if _GROUP_REF_RE.search(p)]
+    joinable = [p for p in patterns if not _GROUP_REF_RE.search(p)]
+    compiled = [re.compile(p, re.IGNORECASE) for p in separate]
+    if not joinable:
+        return compiled
+    try:
+        compiled.append(re.compile('|'.join(f"(?:{p})" for p in joinable), re.IGNORECASE))
+    except re.error:
+        # Patterns with inline flags or repeated group names can't be combined
+        compiled.extend(re.compile(p, re.IGNORECASE) for p in joinable)
+    return compiled
+
+
+def prepare_rule(rule: Dict[str, Any]) -> Dict[str, Any]:
+    """Classify and compile a rule's patterns once so channels can be matched in a single pass"""
+    patterns = rule.get('patterns', [])
+    match_types = rule.get('match_types', ['name'])
+    
+    # Expand comma-separated patterns (e.g., "101-105,107-108" -> ["101-105", "107-108"])
+    expanded_patterns = []
+    for pattern in patterns:
+        if ',' in pattern and 'number' in match_types:
+            # Split comma-separated patterns for number matching
+            expanded_patterns.extend([p.strip() for p in pattern.split(',')])
+        else:
+            expanded_patterns.append(pattern)
+    
+    numeric_singles = set()
+    numeric_ranges = []
+    regex_patterns = []
+    number_patterns = []
+    
+    for pattern in expanded_patterns:
+        kind, value = _classify_pattern(pattern)
+        if kind is _NUM_SINGLE and value is not None and 'number' in match_types:
+            numeric_singles.add(value)
+        elif kind is _NUM_RANGE and value is not None:
+            numeric_ranges.append(value)
+        
+        # Every pattern is also tried as a regex against the selected fields
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            logger.error(f"Invalid regex pattern '{pattern}': {e}")
+            continue
+        
+        regex_patterns.append(pattern)
+        # Use word boundaries to prevent partial matches (e.g., 400 shouldn't match 6400)
+        if kind is _NUM_SINGLE:
+            number_patterns.append(r'\b' + re.escape(pattern) + r'\b')
+        else:
+            number_patterns.append(pattern)
+    
+    return {
+        'include_sources': frozenset(rule.get('include_sources') or []),
+        'exclude_sources': frozenset(rule.get('exclude_sources') or []),
+        'numeric_singles': numeric_singles,
+        'numeric_ranges': sorted(numeric_ranges),
+        'name_regexes': _compile_patterns(regex_patterns) if 'name' in match_types else [],
+        'number_regexes': _compile_patterns(number_patterns) if 'number' in match_types else [],
+        'epg_regexes': _compile_patterns(regex_patterns) if 'epg' in match_types else []
+    }
+
+
+def match_prepared(channel: Dict[str, Any], prepared: Dict[str, Any]) -> bool:
+    """Check if a channel matches a rule prepared by prepare_rule"""
+    # First check source filters
+    include_sources = prepared['include_sources']
+    exclude_sources = prepared['exclude_sources']
+    device_id = channel.get('_device_id', '')
+    
+    # If include sources specified, channel must be from one of them
+    if include_sources and device_id not in include_sources:
+        return False
+    
+    # If exclude sources specified, channel must NOT be from one of them
+    if exclude_sources and device_id in exclude_sources:
+        return False
+    
+    # Convert the channel number once for every numeric and number-regex check
+    channel_num = channel.get('GuideNumber', '')
+    channel_num_str = str(channel_num)
+    channel_num_float = None
+    if channel_num and (prepared['numeric_singles'] or prepared['numeric_ranges']):
+        try:
+            channel_num_float = float(channel_num)
+        except ValueError:
+            pass
+    
+    # Numeric single values and ranges
+    if channel_num_float is not None:
+        if channel_num_float in prepared['numeric_singles']:
+            return True
+        for start, end in prepared['numeric_ranges']:
+            if start <= channel_num_float <= end:
+                return True
+    
+    # Check channel name
+    for regex in prepared['name_regexes']:
+        if regex.search(channel.get('GuideName', '')):
+            return True
+    
+    # Check channel number
+    for regex in prepared['number_regexes']:
+        if regex.search(channel_num_str):
+            return True
+    
+    # Check EPG data (callsign, affiliate, etc)
+    for regex in prepared['epg_regexes']:
+        if regex.search(channel.get('Callsign', '')) or regex.search(channel.get('Affiliate', '')):
+            return True
+    
+    return False
+
+
+def matching_indices(channels: List[Dict[str, Any]], prepared: Dict[str, Any]) -> List[int]:
+    """Return positions of the channels matching a prepared rule"""
+    return [i for i, channel in enumerate(channels) if match_prepared(channel, prepared)]
+
+
+def _match_batch(channels: List[Dict[str, Any]], prepared_rules: List[Dict[str, Any]]) -> List[List[int]]:
+    """Worker task: match a batch of prepared rules against one copy of the channel list"""
+    return [matching_indices(channels, prepared) for prepared in prepared_rules]
+
+
+# Matching processes are started on first use and reused by every later sync
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(processes: int) -> ProcessPoolExecutor:
+    """Return the shared process pool, starting it (or resizing it) if needed"""
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is None or _pool_size != processes:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # 'spawn' avoids forking a process that is running scheduler and web server threads
+            _pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn'))
+            _pool_size = processes
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Drop a pool that failed so the next call starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def match_rules_in_pool(prepared_rules: List[Dict[str, Any]], channels: List[Dict[str, Any]],
+                        processes: int) -> List[List[int]]:
+    """
+    Match prepared rules across worker processes to get around the GIL
+    Rules are split into one batch per process, so the channel list is pickled once per
+    process rather than once per rule. Returns matching channel positions in rule order.
+    """
+    slim_channels = [{key: channel[key] for key in _MATCH_FIELDS if key in channel} for channel in channels]
+    size = -(-len(prepared_rules) // processes)
+    batches = [prepared_rules[i:i + size] for i in range(0, len(prepared_rules), size)]
+    
+    pool = _get_pool(processes)
+    try:
+        futures = [pool.submit(_match_batch, slim_channels, batch) for batch in batches]
+        return [indices for future in futures for indices in future.result()]
+    except Exception:
+        _discard_pool(pool)
+        raise